@@ -22,13 +22,13 @@ func main() {
 	}
 	defer publisher.Close()
 
-	ragClient, err := grpc_client.New(cfg.RAGServiceAddr)
+	ragClient, err := grpc_client.New(cfg.RAGServiceAddr, cfg.RAGIngestAddr)
 	if err != nil {
 		log.Fatalf("Failed to connect to RAG service: %v", err)
 	}
 	defer ragClient.Close()
 
-	h := handlers.New(ragClient, publisher, cfg.UploadPath)
+	h := handlers.New(ragClient, publisher, cfg.UploadPath, cfg.IngestMode)
 
 	r := gin.Default()
 	r.MaxMultipartMemory = 8 << 20
@@ -3,6 +3,8 @@ package grpc_client
 
 import (
 	"context"
+	"errors"
+	"io"
 	"time"
 
 	pb "neuro_search/gateway/pkg/api/v1"
@@ -11,33 +13,43 @@ import (
 	"google.golang.org/grpc/credentials/insecure"
 )
 
-// Client wraps gRPC connection to RAG service.
+// Client wraps gRPC connections to RAG service query and ingest workers.
 type Client struct {
-	conn   *grpc.ClientConn
-	client pb.RagServiceClient
+	conn         *grpc.ClientConn
+	client       pb.RagServiceClient
+	ingestConn   *grpc.ClientConn
+	ingestClient pb.RagServiceClient
 }
 
-// New creates new gRPC client.
-func New(addr string) (*Client, error) {
+// New creates new gRPC client. Uploads are streamed to ingestAddr.
+func New(addr, ingestAddr string) (*Client, error) {
 	conn, err := grpc.Dial(addr, grpc.WithTransportCredentials(insecure.NewCredentials()))
 	if err != nil {
 		return nil, err
 	}
+	ingestConn, err := grpc.Dial(ingestAddr, grpc.WithTransportCredentials(insecure.NewCredentials()))
+	if err != nil {
+		conn.Close()
+		return nil, err
+	}
 	return &Client{
-		conn:   conn,
-		client: pb.NewRagServiceClient(conn),
+		conn:         conn,
+		client:       pb.NewRagServiceClient(conn),
+		ingestConn:   ingestConn,
+		ingestClient: pb.NewRagServiceClient(ingestConn),
 	}, nil
 }
 
-// Close closes gRPC connection.
+// Close closes gRPC connections.
 func (c *Client) Close() error {
-	return c.conn.Close()
+	return errors.Join(c.conn.Close(), c.ingestConn.Close())
 }
 
 // ChatRequest represents chat API request.
 type ChatRequest struct {
 	Message   string
 	SessionID string
+	TenantID  string
 }
 
 // ChatResponse represents chat API response.
@@ -55,6 +67,7 @@ func (c *Client) Chat(ctx context.Context, req *ChatRequest) (*ChatResponse, err
 	resp, err := c.client.GetAnswer(ctx, &pb.ChatRequest{
 		Message:   req.Message,
 		SessionId: req.SessionID,
+		TenantId:  req.TenantID,
 	})
 	if err != nil {
 		return nil, err
@@ -66,3 +79,65 @@ func (c *Client) Chat(ctx context.Context, req *ChatRequest) (*ChatResponse, err
 		SessionID: resp.SessionId,
 	}, nil
 }
+
+// ingestChunkSize is the payload size of each streamed IngestChunk.
+const ingestChunkSize = 64 << 10
+
+// IngestResult represents indexed document summary.
+type IngestResult struct {
+	DocName       string `json:"doc_name"`
+	BytesReceived int64  `json:"bytes_received"`
+	Pages         int32  `json:"pages"`
+	Chunks        int32  `json:"chunks"`
+}
+
+// Ingest streams file to RAG service and waits until it is indexed.
+func (c *Client) Ingest(ctx context.Context, filename, tenantID string, r io.Reader) (*IngestResult, error) {
+	ctx, cancel := context.WithTimeout(ctx, 10*time.Minute)
+	defer cancel()
+
+	stream, err := c.ingestClient.IngestDocument(ctx)
+	if err != nil {
+		return nil, err
+	}
+
+	first := true
+	for {
+		// Fresh buffer per message: Send may still reference the previous one
+		buf := make([]byte, ingestChunkSize)
+		n, readErr := io.ReadFull(r, buf)
+		if readErr != nil && readErr != io.EOF && readErr != io.ErrUnexpectedEOF {
+			return nil, readErr
+		}
+		if n > 0 || first {
+			chunk := &pb.IngestChunk{Data: buf[:n]}
+			if first {
+				chunk.Filename = filename
+				chunk.TenantId = tenantID
+				first = false
+			}
+			if err := stream.Send(chunk); err != nil {
+				// io.EOF means server already ended the call; real status comes from CloseAndRecv
+				if errors.Is(err, io.EOF) {
+					break
+				}
+				return nil, err
+			}
+		}
+		if readErr != nil {
+			break
+		}
+	}
+
+	resp, err := stream.CloseAndRecv()
+	if err != nil {
+		return nil, err
+	}
+
+	return &IngestResult{
+		DocName:       resp.DocName,
+		BytesReceived: resp.BytesReceived,
+		Pages:         resp.Pages,
+		Chunks:        resp.Chunks,
+	}, nil
+}
@@ -5,9 +5,11 @@ import (
 	"context"
 	"fmt"
 	"log"
+	"mime/multipart"
 	"net/http"
 	"os"
 	"path/filepath"
+	"regexp"
 	"strings"
 	"time"
 
@@ -16,6 +18,8 @@ import (
 	"neuro_search/gateway/internal/rabbitmq"
 
 	"github.com/gin-gonic/gin"
+	"google.golang.org/grpc/codes"
+	"google.golang.org/grpc/status"
 )
 
 // Handler contains HTTP handler dependencies.
@@ -23,14 +27,16 @@ type Handler struct {
 	ragClient  *grpc_client.Client
 	publisher  *rabbitmq.Publisher
 	uploadPath string
+	ingestMode string
 }
 
 // New creates new handler.
-func New(ragClient *grpc_client.Client, publisher *rabbitmq.Publisher, uploadPath string) *Handler {
+func New(ragClient *grpc_client.Client, publisher *rabbitmq.Publisher, uploadPath, ingestMode string) *Handler {
 	return &Handler{
 		ragClient:  ragClient,
 		publisher:  publisher,
 		uploadPath: uploadPath,
+		ingestMode: ingestMode,
 	}
 }
 
@@ -42,10 +48,19 @@ func (h *Handler) Health(c *gin.Context) {
 	})
 }
 
+// tenantPattern restricts tenant IDs to names safe for paths and collection names.
+var tenantPattern = regexp.MustCompile(`^[a-z0-9][a-z0-9-]{0,62}$`)
+
+// validTenant reports whether tenant is empty (default tenant) or well-formed.
+func validTenant(tenant string) bool {
+	return tenant == "" || tenantPattern.MatchString(tenant)
+}
+
 // ChatRequest represents chat API request body.
 type ChatRequest struct {
 	Message   string `json:"message" binding:"required"`
 	SessionID string `json:"session_id,omitempty"`
+	TenantID  string `json:"tenant_id,omitempty"`
 }
 
 // Chat handles chat requests.
@@ -53,7 +68,7 @@ func (h *Handler) Chat(c *gin.Context) {
 	start := time.Now()
 
 	var req ChatRequest
-	if err := c.ShouldBindJSON(&req); err != nil {
+	if err := c.ShouldBindJSON(&req); err != nil || !validTenant(req.TenantID) {
 		metrics.RequestCount.WithLabelValues("chat", "bad_request").Inc()
 		c.JSON(http.StatusBadRequest, gin.H{"error": "Invalid request"})
 		return
@@ -62,6 +77,7 @@ func (h *Handler) Chat(c *gin.Context) {
 	resp, err := h.ragClient.Chat(c.Request.Context(), &grpc_client.ChatRequest{
 		Message:   req.Message,
 		SessionID: req.SessionID,
+		TenantID:  req.TenantID,
 	})
 	if err != nil {
 		log.Printf("RAG service error: %v", err)
@@ -104,7 +120,25 @@ func (h *Handler) Ingest(c *gin.Context) {
 		return
 	}
 
-	if err := os.MkdirAll(h.uploadPath, os.ModePerm); err != nil {
+	tenantID := c.PostForm("tenant_id")
+	if !validTenant(tenantID) {
+		metrics.RequestCount.WithLabelValues("ingest", "bad_request").Inc()
+		c.JSON(http.StatusBadRequest, gin.H{"error": "Invalid tenant_id"})
+		return
+	}
+
+	if h.ingestMode == "stream" {
+		h.ingestStream(c, files, tenantID, start)
+		return
+	}
+
+	// Default tenant keeps files in upload root, others under tenants/<id>
+	uploadDir := h.uploadPath
+	if tenantID != "" {
+		uploadDir = filepath.Join(h.uploadPath, "tenants", tenantID)
+	}
+
+	if err := os.MkdirAll(uploadDir, os.ModePerm); err != nil {
 		metrics.RequestCount.WithLabelValues("ingest", "error").Inc()
 		c.JSON(http.StatusInternalServerError, gin.H{"error": "Failed to create upload directory"})
 		return
@@ -121,7 +155,7 @@ func (h *Handler) Ingest(c *gin.Context) {
 		}
 
 		filename := fmt.Sprintf("%d_%s", time.Now().UnixNano(), file.Filename)
-		dst := filepath.Join(h.uploadPath, filename)
+		dst := filepath.Join(uploadDir, filename)
 
 		if err := c.SaveUploadedFile(file, dst); err != nil {
 			log.Printf("Failed to save file: %v", err)
@@ -133,6 +167,7 @@ func (h *Handler) Ingest(c *gin.Context) {
 		err := h.publisher.Publish(context.Background(), &rabbitmq.TaskMessage{
 			TaskID:   taskID,
 			FilePath: dst,
+			TenantID: tenantID,
 		})
 		if err != nil {
 			log.Printf("Failed to publish task: %v", err)
@@ -152,3 +187,80 @@ func (h *Handler) Ingest(c *gin.Context) {
 		"task_ids": taskIDs,
 	})
 }
+
+// IngestError describes file that could not be indexed.
+type IngestError struct {
+	File  string `json:"file"`
+	Error string `json:"error"`
+}
+
+// ingestStream sends files to RAG service over gRPC and responds once they are indexed.
+//
+// Responds 200 when every file was indexed, 207 with per-file errors when only
+// some were, and 400 (all files rejected as invalid) or 502 otherwise.
+func (h *Handler) ingestStream(c *gin.Context, files []*multipart.FileHeader, tenantID string, start time.Time) {
+	documents := []*grpc_client.IngestResult{}
+	var failures []IngestError
+	rejected := 0
+
+	for _, file := range files {
+		ext := strings.ToLower(filepath.Ext(file.Filename))
+		if !allowedExtensions[ext] {
+			log.Printf("Unsupported file format: %s", ext)
+			metrics.FilesUploaded.WithLabelValues("unsupported").Inc()
+			failures = append(failures, IngestError{File: file.Filename, Error: "unsupported file format"})
+			rejected++
+			continue
+		}
+
+		f, err := file.Open()
+		if err != nil {
+			log.Printf("Failed to open upload: %v", err)
+			metrics.FilesUploaded.WithLabelValues("save_error").Inc()
+			failures = append(failures, IngestError{File: file.Filename, Error: "failed to read upload"})
+			continue
+		}
+
+		result, err := h.ragClient.Ingest(c.Request.Context(), file.Filename, tenantID, f)
+		f.Close()
+		if err != nil {
+			log.Printf("Failed to ingest %s: %v", file.Filename, err)
+			metrics.FilesUploaded.WithLabelValues("ingest_error").Inc()
+			st := status.Convert(err)
+			switch st.Code() {
+			case codes.InvalidArgument, codes.ResourceExhausted:
+				failures = append(failures, IngestError{File: file.Filename, Error: st.Message()})
+				rejected++
+			default:
+				failures = append(failures, IngestError{File: file.Filename, Error: "indexing failed"})
+			}
+			continue
+		}
+
+		metrics.FilesUploaded.WithLabelValues("success").Inc()
+		documents = append(documents, result)
+	}
+
+	code, outcome, state := http.StatusOK, "success", "indexed"
+	switch {
+	case len(failures) == 0:
+	case len(documents) > 0:
+		code, outcome, state = http.StatusMultiStatus, "partial", "partial"
+	case rejected == len(failures):
+		code, outcome, state = http.StatusBadRequest, "bad_request", "failed"
+	default:
+		code, outcome, state = http.StatusBadGateway, "error", "failed"
+	}
+
+	metrics.RequestCount.WithLabelValues("ingest", outcome).Inc()
+	metrics.RequestLatency.WithLabelValues("ingest").Observe(time.Since(start).Seconds())
+
+	body := gin.H{
+		"status":    state,
+		"documents": documents,
+	}
+	if len(failures) > 0 {
+		body["errors"] = failures
+	}
+	c.JSON(code, body)
+}
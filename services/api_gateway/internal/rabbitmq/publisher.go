@@ -21,6 +21,7 @@ type Publisher struct {
 type TaskMessage struct {
 	TaskID   string `json:"task_id"`
 	FilePath string `json:"file_path"`
+	TenantID string `json:"tenant_id,omitempty"`
 }
 
 // New creates new RabbitMQ publisher.
@@ -26,6 +26,7 @@ type ChatRequest struct {
 	Message       string                 `protobuf:"bytes,1,opt,name=message,proto3" json:"message,omitempty"`
 	History       []*MessageHistory      `protobuf:"bytes,2,rep,name=history,proto3" json:"history,omitempty"`
 	SessionId     string                 `protobuf:"bytes,3,opt,name=session_id,json=sessionId,proto3" json:"session_id,omitempty"` // Optional: existing session ID
+	TenantId      string                 `protobuf:"bytes,4,opt,name=tenant_id,json=tenantId,proto3" json:"tenant_id,omitempty"`    // Optional: tenant (business unit), default tenant if empty
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
 }
@@ -81,6 +82,13 @@ func (x *ChatRequest) GetSessionId() string {
 	return ""
 }
 
+func (x *ChatRequest) GetTenantId() string {
+	if x != nil {
+		return x.TenantId
+	}
+	return ""
+}
+
 type MessageHistory struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	Role          string                 `protobuf:"bytes,1,opt,name=role,proto3" json:"role,omitempty"`
@@ -253,16 +261,146 @@ func (x *Source) GetScore() float32 {
 	return 0
 }
 
+// Piece of uploaded file; filename and tenant_id are read from the first message
+type IngestChunk struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Filename      string                 `protobuf:"bytes,1,opt,name=filename,proto3" json:"filename,omitempty"`                 // Original file name, extension selects the parser
+	TenantId      string                 `protobuf:"bytes,2,opt,name=tenant_id,json=tenantId,proto3" json:"tenant_id,omitempty"` // Optional: tenant (business unit), default tenant if empty
+	Data          []byte                 `protobuf:"bytes,3,opt,name=data,proto3" json:"data,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *IngestChunk) Reset() {
+	*x = IngestChunk{}
+	mi := &file_rag_service_proto_msgTypes[4]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *IngestChunk) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*IngestChunk) ProtoMessage() {}
+
+func (x *IngestChunk) ProtoReflect() protoreflect.Message {
+	mi := &file_rag_service_proto_msgTypes[4]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use IngestChunk.ProtoReflect.Descriptor instead.
+func (*IngestChunk) Descriptor() ([]byte, []int) {
+	return file_rag_service_proto_rawDescGZIP(), []int{4}
+}
+
+func (x *IngestChunk) GetFilename() string {
+	if x != nil {
+		return x.Filename
+	}
+	return ""
+}
+
+func (x *IngestChunk) GetTenantId() string {
+	if x != nil {
+		return x.TenantId
+	}
+	return ""
+}
+
+func (x *IngestChunk) GetData() []byte {
+	if x != nil {
+		return x.Data
+	}
+	return nil
+}
+
+type IngestResponse struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	DocName       string                 `protobuf:"bytes,1,opt,name=doc_name,json=docName,proto3" json:"doc_name,omitempty"` // Name document is stored and cited under
+	BytesReceived int64                  `protobuf:"varint,2,opt,name=bytes_received,json=bytesReceived,proto3" json:"bytes_received,omitempty"`
+	Pages         int32                  `protobuf:"varint,3,opt,name=pages,proto3" json:"pages,omitempty"`
+	Chunks        int32                  `protobuf:"varint,4,opt,name=chunks,proto3" json:"chunks,omitempty"` // Chunks indexed
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *IngestResponse) Reset() {
+	*x = IngestResponse{}
+	mi := &file_rag_service_proto_msgTypes[5]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *IngestResponse) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*IngestResponse) ProtoMessage() {}
+
+func (x *IngestResponse) ProtoReflect() protoreflect.Message {
+	mi := &file_rag_service_proto_msgTypes[5]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use IngestResponse.ProtoReflect.Descriptor instead.
+func (*IngestResponse) Descriptor() ([]byte, []int) {
+	return file_rag_service_proto_rawDescGZIP(), []int{5}
+}
+
+func (x *IngestResponse) GetDocName() string {
+	if x != nil {
+		return x.DocName
+	}
+	return ""
+}
+
+func (x *IngestResponse) GetBytesReceived() int64 {
+	if x != nil {
+		return x.BytesReceived
+	}
+	return 0
+}
+
+func (x *IngestResponse) GetPages() int32 {
+	if x != nil {
+		return x.Pages
+	}
+	return 0
+}
+
+func (x *IngestResponse) GetChunks() int32 {
+	if x != nil {
+		return x.Chunks
+	}
+	return 0
+}
+
 var File_rag_service_proto protoreflect.FileDescriptor
 
 const file_rag_service_proto_rawDesc = "" +
 	"\n" +
-	"\x11rag_service.proto\x12\x02v1\"t\n" +
+	"\x11rag_service.proto\x12\x02v1\"\x91\x01\n" +
 	"\vChatRequest\x12\x18\n" +
 	"\amessage\x18\x01 \x01(\tR\amessage\x12,\n" +
 	"\ahistory\x18\x02 \x03(\v2\x12.v1.MessageHistoryR\ahistory\x12\x1d\n" +
 	"\n" +
-	"session_id\x18\x03 \x01(\tR\tsessionId\">\n" +
+	"session_id\x18\x03 \x01(\tR\tsessionId\x12\x1b\n" +
+	"\ttenant_id\x18\x04 \x01(\tR\btenantId\">\n" +
 	"\x0eMessageHistory\x12\x12\n" +
 	"\x04role\x18\x01 \x01(\tR\x04role\x12\x18\n" +
 	"\acontent\x18\x02 \x01(\tR\acontent\"k\n" +
@@ -275,10 +413,20 @@ const file_rag_service_proto_rawDesc = "" +
 	"\x06Source\x12\x19\n" +
 	"\bdoc_name\x18\x01 \x01(\tR\adocName\x12\x12\n" +
 	"\x04page\x18\x02 \x01(\x05R\x04page\x12\x14\n" +
-	"\x05score\x18\x03 \x01(\x02R\x05score2<\n" +
+	"\x05score\x18\x03 \x01(\x02R\x05score\"Z\n" +
+	"\vIngestChunk\x12\x1a\n" +
+	"\bfilename\x18\x01 \x01(\tR\bfilename\x12\x1b\n" +
+	"\ttenant_id\x18\x02 \x01(\tR\btenantId\x12\x12\n" +
+	"\x04data\x18\x03 \x01(\fR\x04data\"\x80\x01\n" +
+	"\x0eIngestResponse\x12\x19\n" +
+	"\bdoc_name\x18\x01 \x01(\tR\adocName\x12%\n" +
+	"\x0ebytes_received\x18\x02 \x01(\x03R\rbytesReceived\x12\x14\n" +
+	"\x05pages\x18\x03 \x01(\x05R\x05pages\x12\x16\n" +
+	"\x06chunks\x18\x04 \x01(\x05R\x06chunks2u\n" +
 	"\n" +
 	"RagService\x12.\n" +
-	"\tGetAnswer\x12\x0f.v1.ChatRequest\x1a\x10.v1.ChatResponseB!Z\x1fneuro_search/gateway/pkg/api/v1b\x06proto3"
+	"\tGetAnswer\x12\x0f.v1.ChatRequest\x1a\x10.v1.ChatResponse\x127\n" +
+	"\x0eIngestDocument\x12\x0f.v1.IngestChunk\x1a\x12.v1.IngestResponse(\x01B!Z\x1fneuro_search/gateway/pkg/api/v1b\x06proto3"
 
 var (
 	file_rag_service_proto_rawDescOnce sync.Once
@@ -292,20 +440,24 @@ func file_rag_service_proto_rawDescGZIP() []byte {
 	return file_rag_service_proto_rawDescData
 }
 
-var file_rag_service_proto_msgTypes = make([]protoimpl.MessageInfo, 4)
+var file_rag_service_proto_msgTypes = make([]protoimpl.MessageInfo, 6)
 var file_rag_service_proto_goTypes = []any{
 	(*ChatRequest)(nil),    // 0: v1.ChatRequest
 	(*MessageHistory)(nil), // 1: v1.MessageHistory
 	(*ChatResponse)(nil),   // 2: v1.ChatResponse
 	(*Source)(nil),         // 3: v1.Source
+	(*IngestChunk)(nil),    // 4: v1.IngestChunk
+	(*IngestResponse)(nil), // 5: v1.IngestResponse
 }
 var file_rag_service_proto_depIdxs = []int32{
 	1, // 0: v1.ChatRequest.history:type_name -> v1.MessageHistory
 	3, // 1: v1.ChatResponse.sources:type_name -> v1.Source
 	0, // 2: v1.RagService.GetAnswer:input_type -> v1.ChatRequest
-	2, // 3: v1.RagService.GetAnswer:output_type -> v1.ChatResponse
-	3, // [3:4] is the sub-list for method output_type
-	2, // [2:3] is the sub-list for method input_type
+	4, // 3: v1.RagService.IngestDocument:input_type -> v1.IngestChunk
+	2, // 4: v1.RagService.GetAnswer:output_type -> v1.ChatResponse
+	5, // 5: v1.RagService.IngestDocument:output_type -> v1.IngestResponse
+	4, // [4:6] is the sub-list for method output_type
+	2, // [2:4] is the sub-list for method input_type
 	2, // [2:2] is the sub-list for extension type_name
 	2, // [2:2] is the sub-list for extension extendee
 	0, // [0:2] is the sub-list for field type_name
@@ -322,7 +474,7 @@ func file_rag_service_proto_init() {
 			GoPackagePath: reflect.TypeOf(x{}).PkgPath(),
 			RawDescriptor: unsafe.Slice(unsafe.StringData(file_rag_service_proto_rawDesc), len(file_rag_service_proto_rawDesc)),
 			NumEnums:      0,
-			NumMessages:   4,
+			NumMessages:   6,
 			NumExtensions: 0,
 			NumServices:   1,
 		},
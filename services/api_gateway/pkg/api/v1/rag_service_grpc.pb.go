@@ -19,7 +19,8 @@ import (
 const _ = grpc.SupportPackageIsVersion9
 
 const (
-	RagService_GetAnswer_FullMethodName = "/v1.RagService/GetAnswer"
+	RagService_GetAnswer_FullMethodName      = "/v1.RagService/GetAnswer"
+	RagService_IngestDocument_FullMethodName = "/v1.RagService/IngestDocument"
 )
 
 // RagServiceClient is the client API for RagService service.
@@ -27,6 +28,8 @@ const (
 // For semantics around ctx use and closing/ending streaming RPCs, please refer to https://pkg.go.dev/google.golang.org/grpc/?tab=doc#ClientConn.NewStream.
 type RagServiceClient interface {
 	GetAnswer(ctx context.Context, in *ChatRequest, opts ...grpc.CallOption) (*ChatResponse, error)
+	// Upload file in chunks and index it synchronously
+	IngestDocument(ctx context.Context, opts ...grpc.CallOption) (grpc.ClientStreamingClient[IngestChunk, IngestResponse], error)
 }
 
 type ragServiceClient struct {
@@ -47,11 +50,26 @@ func (c *ragServiceClient) GetAnswer(ctx context.Context, in *ChatRequest, opts
 	return out, nil
 }
 
+func (c *ragServiceClient) IngestDocument(ctx context.Context, opts ...grpc.CallOption) (grpc.ClientStreamingClient[IngestChunk, IngestResponse], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &RagService_ServiceDesc.Streams[0], RagService_IngestDocument_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[IngestChunk, IngestResponse]{ClientStream: stream}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type RagService_IngestDocumentClient = grpc.ClientStreamingClient[IngestChunk, IngestResponse]
+
 // RagServiceServer is the server API for RagService service.
 // All implementations must embed UnimplementedRagServiceServer
 // for forward compatibility.
 type RagServiceServer interface {
 	GetAnswer(context.Context, *ChatRequest) (*ChatResponse, error)
+	// Upload file in chunks and index it synchronously
+	IngestDocument(grpc.ClientStreamingServer[IngestChunk, IngestResponse]) error
 	mustEmbedUnimplementedRagServiceServer()
 }
 
@@ -65,6 +83,9 @@ type UnimplementedRagServiceServer struct{}
 func (UnimplementedRagServiceServer) GetAnswer(context.Context, *ChatRequest) (*ChatResponse, error) {
 	return nil, status.Error(codes.Unimplemented, "method GetAnswer not implemented")
 }
+func (UnimplementedRagServiceServer) IngestDocument(grpc.ClientStreamingServer[IngestChunk, IngestResponse]) error {
+	return status.Error(codes.Unimplemented, "method IngestDocument not implemented")
+}
 func (UnimplementedRagServiceServer) mustEmbedUnimplementedRagServiceServer() {}
 func (UnimplementedRagServiceServer) testEmbeddedByValue()                    {}
 
@@ -104,6 +125,13 @@ func _RagService_GetAnswer_Handler(srv interface{}, ctx context.Context, dec fun
 	return interceptor(ctx, in, info, handler)
 }
 
+func _RagService_IngestDocument_Handler(srv interface{}, stream grpc.ServerStream) error {
+	return srv.(RagServiceServer).IngestDocument(&grpc.GenericServerStream[IngestChunk, IngestResponse]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type RagService_IngestDocumentServer = grpc.ClientStreamingServer[IngestChunk, IngestResponse]
+
 // RagService_ServiceDesc is the grpc.ServiceDesc for RagService service.
 // It's only intended for direct use with grpc.RegisterService,
 // and not to be introspected or modified (even as a copy)
@@ -116,6 +144,12 @@ var RagService_ServiceDesc = grpc.ServiceDesc{
 			Handler:    _RagService_GetAnswer_Handler,
 		},
 	},
-	Streams:  []grpc.StreamDesc{},
+	Streams: []grpc.StreamDesc{
+		{
+			StreamName:    "IngestDocument",
+			Handler:       _RagService_IngestDocument_Handler,
+			ClientStreams: true,
+		},
+	},
 	Metadata: "rag_service.proto",
 }
@@ -0,0 +1 @@
+"""Benchmarks against live infrastructure."""
@@ -0,0 +1,205 @@
+"""Synthetic PDF/DOCX/TXT corpus generator for ingestion benchmarks.
+
+Run with ``python -m app.benchmarks.corpus --out DIR``. Output is fully
+determined by the arguments, so the same corpus can be rebuilt for
+comparing runs.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+
+import docx
+
+FORMATS = ("pdf", "docx", "txt")
+SPEC_FILE = "corpus.json"
+
+# Mix of short and long words so token/char ratio resembles prose
+VOCABULARY = (
+    "the of and to in is for on with as by that this from be are policy employee "
+    "request approval manager department document procedure travel expense report "
+    "contract payment invoice budget quarter annual review compliance security access "
+    "system account information schedule meeting deadline responsibility requirement "
+    "application reimbursement authorization documentation infrastructure organization"
+).split()
+
+PDF_LINE_CHARS = 95
+
+
+def _sentence(rng: random.Random) -> str:
+    """Random sentence of 8-20 words."""
+    words = rng.choices(VOCABULARY, k=rng.randint(8, 20))
+    return " ".join(words).capitalize() + "."
+
+
+def page_text(rng: random.Random, words_per_page: int) -> list[str]:
+    """Paragraphs totalling roughly words_per_page words."""
+    paragraphs, count = [], 0
+    while count < words_per_page:
+        sentences = [_sentence(rng) for _ in range(rng.randint(3, 7))]
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        count += len(paragraph.split())
+    return paragraphs
+
+
+def _wrap(paragraphs: list[str], width: int) -> list[str]:
+    """Wrap paragraphs into lines of at most width characters."""
+    lines = []
+    for paragraph in paragraphs:
+        line = ""
+        for word in paragraph.split():
+            if line and len(line) + 1 + len(word) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = f"{line} {word}" if line else word
+        lines.append(line)
+        lines.append("")
+    return lines
+
+
+def write_txt(path: str, pages: list[list[str]]) -> None:
+    """Write pages as plain text separated by blank lines."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n\n".join("\n\n".join(paragraphs) for paragraphs in pages))
+
+
+def write_docx(path: str, pages: list[list[str]]) -> None:
+    """Write pages as DOCX paragraphs with explicit page breaks."""
+    document = docx.Document()
+    for i, paragraphs in enumerate(pages):
+        if i:
+            document.add_page_break()
+        for paragraph in paragraphs:
+            document.add_paragraph(paragraph)
+    document.save(path)
+
+
+def write_pdf(path: str, pages: list[list[str]]) -> None:
+    """Write pages as minimal text-only PDF (Helvetica, one content stream per page).
+
+    Long pages run past the bottom edge; text extraction still sees all of it,
+    so every format carries the same words per page.
+    """
+    objects: list[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")
+    pages_obj = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for paragraphs in pages:
+        lines = _wrap(paragraphs, PDF_LINE_CHARS)
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 760 Td"]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({escaped}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_obj, font, content)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[pages_obj - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog, xref,
+    )
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+WRITERS = {"pdf": write_pdf, "docx": write_docx, "txt": write_txt}
+
+
+def generate_corpus(
+    out_dir: str,
+    files: int,
+    pages_per_file: int,
+    words_per_page: int,
+    formats: tuple[str, ...] = FORMATS,
+    seed: int = 0,
+) -> dict:
+    """Generate files round-robin over formats. Returns corpus spec (also saved to corpus.json)."""
+    spec = {
+        "files": files,
+        "pages_per_file": pages_per_file,
+        "words_per_page": words_per_page,
+        "formats": list(formats),
+        "seed": seed,
+    }
+    spec_path = os.path.join(out_dir, SPEC_FILE)
+    if os.path.exists(spec_path):
+        with open(spec_path) as f:
+            if json.load(f) == spec:
+                return spec
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name in os.listdir(out_dir):
+        if name.startswith("synthetic_"):
+            os.remove(os.path.join(out_dir, name))
+
+    rng = random.Random(seed)
+    for i in range(files):
+        fmt = formats[i % len(formats)]
+        pages = [page_text(rng, words_per_page) for _ in range(pages_per_file)]
+        WRITERS[fmt](os.path.join(out_dir, f"synthetic_{i:05d}.{fmt}"), pages)
+
+    with open(spec_path, "w") as f:
+        json.dump(spec, f)
+    return spec
+
+
+def corpus_files(out_dir: str) -> list[str]:
+    """Generated files in stable order."""
+    return sorted(
+        os.path.join(out_dir, name)
+        for name in os.listdir(out_dir)
+        if name.startswith("synthetic_")
+    )
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register corpus size options."""
+    parser.add_argument("--files", type=int, default=30)
+    parser.add_argument("--pages", type=int, default=10, help="pages per file")
+    parser.add_argument("--words-per-page", type=int, default=350)
+    parser.add_argument("--formats", default=",".join(FORMATS), help="comma-separated subset of pdf,docx,txt")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main() -> None:
+    """Corpus generator entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True)
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+    spec = generate_corpus(
+        args.out, args.files, args.pages, args.words_per_page, tuple(args.formats.split(",")), args.seed
+    )
+    print(json.dumps(spec))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""History-fetch latency benchmark.
+
+Run with ``python -m app.benchmarks.history_fetch``. Seeds synthetic sessions
+and messages spread over past months into the configured database, measures
+``get_messages`` latency for random sessions and prints the query plan. Seeded
+rows are removed afterwards unless --keep is given. Use staging database only.
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import db
+from app.crud import get_messages
+from app.services.retention import ensure_partitions
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Unlogged table tracking seeded session ids for cleanup
+BENCH_TABLE = "bench_history_sessions"
+SEED_BATCH_SESSIONS = 1000
+
+
+async def seed(sessions: int, messages_per_session: int, months: int) -> None:
+    """Insert synthetic sessions with messages spread over past months."""
+    start = datetime.now(timezone.utc).date() - timedelta(days=30 * months)
+
+    async with db.engine.begin() as conn:
+        await conn.execute(text(f"CREATE UNLOGGED TABLE IF NOT EXISTS {BENCH_TABLE} (id UUID PRIMARY KEY)"))
+        await ensure_partitions(conn, start, settings.MESSAGE_PARTITIONS_AHEAD)
+
+    seeded = 0
+    while seeded < sessions:
+        batch = min(SEED_BATCH_SESSIONS, sessions - seeded)
+        async with db.engine.begin() as conn:
+            await conn.execute(text(f"""
+                WITH new_sessions AS (
+                    INSERT INTO {BENCH_TABLE} (id)
+                    SELECT gen_random_uuid() FROM generate_series(1, :batch)
+                    RETURNING id
+                ), sessions AS (
+                    INSERT INTO chat_sessions (id, created_at, updated_at)
+                    SELECT id, now() - random() * make_interval(days => :days), now()
+                    FROM new_sessions
+                    RETURNING id, created_at
+                )
+                INSERT INTO messages (id, session_id, role, content, created_at)
+                SELECT
+                    gen_random_uuid(),
+                    s.id,
+                    CASE WHEN n % 2 = 0 THEN 'user' ELSE 'assistant' END,
+                    repeat('synthetic message ', 20),
+                    LEAST(s.created_at + n * interval '1 minute', now())
+                FROM sessions s, generate_series(1, :per_session) n
+            """), {"batch": batch, "days": 30 * months, "per_session": messages_per_session})
+        seeded += batch
+        logger.info("Seeded %d/%d sessions", seeded, sessions)
+
+    async with db.engine.begin() as conn:
+        await conn.execute(text("ANALYZE chat_sessions"))
+        await conn.execute(text("ANALYZE messages"))
+
+
+async def measure(iterations: int, concurrency: int, limit: int) -> list[float]:
+    """Time get_messages for random seeded sessions. Returns latencies in ms."""
+    async with db.engine.connect() as conn:
+        result = await conn.execute(text(f"SELECT id FROM {BENCH_TABLE} ORDER BY random() LIMIT :n"), {"n": iterations})
+        session_ids = [row[0] for row in result.all()]
+
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(session_id) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await get_messages(session_id, limit=limit)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(fetch(sid) for sid in session_ids))
+    return latencies
+
+
+async def explain(limit: int) -> str:
+    """EXPLAIN ANALYZE history query (as issued by get_messages) for one seeded session."""
+    async with db.engine.connect() as conn:
+        session_id = await conn.scalar(text(f"SELECT id FROM {BENCH_TABLE} LIMIT 1"))
+        result = await conn.execute(text("""
+            EXPLAIN (ANALYZE, BUFFERS)
+            SELECT * FROM messages
+            WHERE session_id = :sid
+              AND created_at >= (SELECT created_at - interval '1 hour' FROM chat_sessions WHERE id = :sid)
+            ORDER BY created_at DESC LIMIT :limit
+        """), {"sid": session_id, "limit": limit})
+        return "\n".join(row[0] for row in result.all())
+
+
+async def cleanup() -> None:
+    """Remove seeded sessions (messages cascade) and tracking table."""
+    async with db.engine.begin() as conn:
+        await conn.execute(text(f"DELETE FROM chat_sessions WHERE id IN (SELECT id FROM {BENCH_TABLE})"))
+        await conn.execute(text(f"DROP TABLE {BENCH_TABLE}"))
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Migrate, seed, measure, report and clean up."""
+    await db.migrate()
+    try:
+        if args.sessions:
+            seed_start = time.perf_counter()
+            await seed(args.sessions, args.messages, args.months)
+            logger.info("Seeding took %.1fs", time.perf_counter() - seed_start)
+
+        # Warm up connection pool and plan cache
+        await measure(min(args.iterations, 50), args.concurrency, args.limit)
+        latencies = await measure(args.iterations, args.concurrency, args.limit)
+
+        async with db.engine.connect() as conn:
+            total = await conn.scalar(text("SELECT count(*) FROM messages"))
+
+        print(f"messages in table: {total}")
+        print(f"fetches: {len(latencies)} (concurrency {args.concurrency}, limit {args.limit})")
+        print(
+            f"latency ms: mean={statistics.mean(latencies):.2f} "
+            f"p50={percentile(latencies, 0.50):.2f} "
+            f"p95={percentile(latencies, 0.95):.2f} "
+            f"p99={percentile(latencies, 0.99):.2f} "
+            f"max={max(latencies):.2f}"
+        )
+        print(await explain(args.limit))
+    finally:
+        if not args.keep:
+            await cleanup()
+        await db.close()
+
+
+def main() -> None:
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100_000, help="sessions to seed (0 to reuse kept data)")
+    parser.add_argument("--messages", type=int, default=20, help="messages per session")
+    parser.add_argument("--months", type=int, default=12, help="spread sessions over this many past months")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help="keep seeded data for repeated runs")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Ingestion throughput benchmark.
+
+Run with ``python -m app.benchmarks.ingestion``. Generates (or reuses) a
+synthetic corpus and measures, with peak RSS for each stage:
+
+- parse, split, embed, upsert: each pipeline stage timed separately over the
+  whole corpus, upserting into a temporary collection
+- end_to_end: process_document per file, as the ingestion consumer runs it,
+  into a temporary tenant, with empty embedding store and parsed text cache
+- end_to_end_warm: the same again with caches filled by the cold run
+
+Embedding store and parsed text cache live in a scratch directory for the
+run, so production caches are neither read nor written. Collections and
+scratch directory are removed afterwards. The JSON report (--output) records
+corpus and settings, and --compare prints change against an earlier report.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from app.benchmarks.corpus import add_corpus_arguments, corpus_files, generate_corpus
+from app.core.config import settings
+
+# Must be set before services create their caches on import
+SCRATCH_DIR = tempfile.mkdtemp(prefix="rag_bench_")
+settings.EMBEDDING_STORE_DIR = os.path.join(SCRATCH_DIR, "embedding_store")
+settings.PARSED_CACHE_DIR = os.path.join(SCRATCH_DIR, "parsed_cache")
+
+from app.infrastructure.embedding_store import EmbeddingStore  # noqa: E402
+from app.infrastructure.parsed_cache import ParsedTextCache  # noqa: E402
+from app.infrastructure.qdrant import qdrant_service  # noqa: E402
+from app.services import document_processor  # noqa: E402
+from app.services.document_processor import (  # noqa: E402
+    LOADER_VERSION,
+    load_document,
+    process_document,
+    split_documents,
+    text_splitter,
+)
+from app.services.embeddings import embeddings_service  # noqa: E402
+
+
+class RssSampler:
+    """Track peak resident set size of this process while active."""
+
+    def __init__(self, interval: float = 0.05) -> None:
+        """Initialize sampler."""
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def current() -> int:
+        """Current RSS in bytes (peak so far where /proc is unavailable)."""
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except OSError:
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _run(self) -> None:
+        """Sample until stopped."""
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.current())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> RssSampler:
+        """Start sampling."""
+        self.peak = self.current()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.current())
+
+
+def stage_result(seconds: float, rss: RssSampler, files: int, pages: int, chunks: int,
+                 tokens: int = 0, size: int = 0) -> dict:
+    """Build report entry with throughput rates."""
+    seconds = max(seconds, 1e-9)
+    return {
+        "seconds": round(seconds, 3),
+        "files": files,
+        "pages": pages,
+        "chunks": chunks,
+        "pages_per_s": round(pages / seconds, 2),
+        "chunks_per_s": round(chunks / seconds, 2) if chunks else None,
+        "tokens_per_s": round(tokens / seconds, 1) if tokens else None,
+        "mb_per_s": round(size / seconds / 1024**2, 3) if size else None,
+        "peak_rss_mb": round(rss.peak / 1024**2, 1),
+    }
+
+
+def run_stages(files: list[str]) -> dict:
+    """Time parse, split, embed and upsert stages one after another."""
+    results = {}
+    total_bytes = sum(os.path.getsize(path) for path in files)
+
+    with RssSampler() as rss:
+        start = time.perf_counter()
+        parsed = [load_document(path) for path in files]
+        pages = sum(len(docs) for docs in parsed)
+        results["parse"] = stage_result(time.perf_counter() - start, rss, len(files), pages, 0, size=total_bytes)
+
+    with RssSampler() as rss:
+        start = time.perf_counter()
+        split = [split_documents(docs) for docs in parsed]
+        elapsed = time.perf_counter() - start
+        chunks = sum(len(c) for c in split)
+        tokens = sum(chunk.metadata["token_count"] for c in split for chunk in c)
+        results["split"] = stage_result(elapsed, rss, len(files), pages, chunks, tokens=tokens)
+
+    with RssSampler() as rss:
+        start = time.perf_counter()
+        vectors = [embeddings_service.document_model.embed_documents([c.page_content for c in chunks_of_file])
+                   for chunks_of_file in split]
+        results["embed"] = stage_result(time.perf_counter() - start, rss, len(files), pages, chunks, tokens=tokens)
+
+    client = QdrantClient(
+        host=settings.QDRANT_HOST,
+        port=settings.QDRANT_PORT,
+        grpc_port=settings.QDRANT_GRPC_PORT,
+        prefer_grpc=settings.QDRANT_PREFER_GRPC,
+    )
+    # Same collection setup (payload indexes included) as tenant collections
+    collection = f"bench_ingest_{uuid.uuid4().hex[:8]}"
+    asyncio.run(qdrant_service.create_collection(collection))
+    try:
+        points = [
+            models.PointStruct(
+                id=uuid.uuid4().hex,
+                vector=vector,
+                payload={"page_content": chunk.page_content, "metadata": chunk.metadata},
+            )
+            for chunks_of_file, vectors_of_file in zip(split, vectors)
+            for chunk, vector in zip(chunks_of_file, vectors_of_file)
+        ]
+        batch = settings.QDRANT_UPSERT_BATCH_SIZE
+        with RssSampler() as rss:
+            start = time.perf_counter()
+            for i in range(0, len(points), batch):
+                client.upsert(collection, points[i:i + batch], wait=True)
+            results["upsert"] = stage_result(time.perf_counter() - start, rss, len(files), pages, chunks)
+    finally:
+        client.close()
+        asyncio.run(qdrant_service.drop_collection(collection))
+
+    return results
+
+
+def reset_caches() -> None:
+    """Replace embedding store and parsed text cache with empty ones in scratch directory."""
+    run = tempfile.mkdtemp(dir=SCRATCH_DIR)
+    if settings.EMBEDDING_STORE_ENABLED:
+        embeddings_service.document_model.store = EmbeddingStore(
+            os.path.join(run, "embedding_store"),
+            settings.EMBEDDINGS_MODEL,
+            settings.EMBEDDING_STORE_MAX_BYTES,
+        )
+    if settings.PARSED_CACHE_ENABLED:
+        document_processor.parsed_cache = ParsedTextCache(os.path.join(run, "parsed_cache"), LOADER_VERSION)
+
+
+async def run_end_to_end(files: list[str], concurrency: int) -> dict:
+    """Run process_document for every file in temporary tenant."""
+    tenant = f"bench-{uuid.uuid4().hex[:8]}"
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def ingest(path: str) -> None:
+        async with semaphore:
+            await process_document(path, tenant)
+
+    try:
+        with RssSampler() as rss:
+            start = time.perf_counter()
+            await asyncio.gather(*(ingest(path) for path in files))
+            elapsed = time.perf_counter() - start
+        chunks = await qdrant_service.count(qdrant_service.collection_for(tenant))
+    finally:
+        target = await qdrant_service.get_alias_target(tenant)
+        if target:
+            await qdrant_service.drop_collection(target)
+
+    pages = sum(len(load_document(path)) for path in files)
+    return stage_result(elapsed, rss, len(files), pages, chunks)
+
+
+def git_commit() -> str | None:
+    """Current commit hash if running from git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict, baseline: dict | None) -> None:
+    """Print stage table, with relative change against baseline if given."""
+    columns = ("seconds", "pages_per_s", "chunks_per_s", "tokens_per_s", "mb_per_s", "peak_rss_mb")
+    print(f"{'stage':<16}" + "".join(f"{c:>22}" for c in columns))
+    for stage, values in report["stages"].items():
+        row = f"{stage:<16}"
+        for column in columns:
+            value = values.get(column)
+            cell = "-" if value is None else f"{value:,.3f}" if value < 100 else f"{value:,.0f}"
+            old = (baseline or {}).get("stages", {}).get(stage, {}).get(column)
+            if value is not None and old:
+                cell += f" ({(value - old) / old * 100:+.0f}%)"
+            row += f"{cell:>22}"
+        print(row)
+
+
+def main() -> None:
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "rag_bench_corpus"))
+    add_corpus_arguments(parser)
+    parser.add_argument("--mode", choices=("all", "stages", "end_to_end"), default="all")
+    parser.add_argument("--concurrency", type=int, default=1, help="parallel documents in end_to_end mode")
+    parser.add_argument("--output", help="write JSON report to file")
+    parser.add_argument("--compare", help="earlier JSON report to compare with")
+    args = parser.parse_args()
+
+    spec = generate_corpus(
+        args.corpus_dir, args.files, args.pages, args.words_per_page, tuple(args.formats.split(",")), args.seed
+    )
+    files = corpus_files(args.corpus_dir)
+
+    stages = {}
+    try:
+        if args.mode in ("all", "stages"):
+            stages.update(run_stages(files))
+        if args.mode in ("all", "end_to_end"):
+            reset_caches()
+            stages["end_to_end"] = asyncio.run(run_end_to_end(files, args.concurrency))
+            stages["end_to_end_warm"] = asyncio.run(run_end_to_end(files, args.concurrency))
+    finally:
+        shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": git_commit(),
+        "host": platform.node(),
+        "cpu_count": os.cpu_count(),
+        "corpus": spec,
+        "settings": {
+            "chunk_size_tokens": text_splitter.chunk_size,
+            "chunk_overlap_tokens": text_splitter.chunk_overlap,
+            "embeddings_model": settings.EMBEDDINGS_MODEL,
+            "embedding_batch_size": settings.EMBEDDING_BATCH_SIZE,
+            "embedding_store_enabled": settings.EMBEDDING_STORE_ENABLED,
+            "parsed_cache_enabled": settings.PARSED_CACHE_ENABLED,
+            "qdrant_upsert_batch_size": settings.QDRANT_UPSERT_BATCH_SIZE,
+            "concurrency": args.concurrency,
+        },
+        "stages": stages,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("corpus") != spec:
+            print("warning: baseline was measured on different corpus")
+
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
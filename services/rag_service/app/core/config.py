@@ -14,27 +14,143 @@ class Settings:
     QDRANT_PORT: int = int(os.getenv("QDRANT_PORT", "6333"))
     QDRANT_GRPC_PORT: int = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
     QDRANT_PREFER_GRPC: bool = True
+    # Alias pointing to current versioned collection (see app/reindex.py);
+    # default tenant's alias, other tenants get "<alias>_t_<tenant_id>"
     QDRANT_COLLECTION: str = "documents"
+    QDRANT_UPSERT_BATCH_SIZE: int = int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "256"))
+    QDRANT_INDEXING_THRESHOLD: int = int(os.getenv("QDRANT_INDEXING_THRESHOLD", "20000"))
 
     DB_HOST: str = os.getenv("DB_HOST", "postgres")
     DB_USER: str = os.getenv("POSTGRES_USER", "user")
     DB_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "password")
     DB_NAME: str = os.getenv("POSTGRES_DB", "neurosearch")
 
+    MESSAGE_RETENTION_ENABLED: bool = os.getenv("MESSAGE_RETENTION_ENABLED", "true").lower() == "true"
+    MESSAGE_RETENTION_DAYS: int = int(os.getenv("MESSAGE_RETENTION_DAYS", "180"))
+    MESSAGE_PARTITIONS_AHEAD: int = 3
+    # Detached partitions are moved here; empty value drops them instead
+    MESSAGE_ARCHIVE_SCHEMA: str = os.getenv("MESSAGE_ARCHIVE_SCHEMA", "archive")
+    RETENTION_INTERVAL_SECONDS: int = int(os.getenv("RETENTION_INTERVAL_SECONDS", "3600"))
+
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "")
     LLM_MODEL: str = "gpt-4o-mini"
-    EMBEDDINGS_MODEL: str = "all-MiniLM-L6-v2"
+    # Comma-separated fallback endpoints in order: "model" or "model@base_url"
+    LLM_FALLBACK_ENDPOINTS: str = os.getenv("LLM_FALLBACK_ENDPOINTS", "")
+    LLM_ATTEMPT_TIMEOUT_SECONDS: float = float(os.getenv("LLM_ATTEMPT_TIMEOUT_SECONDS", "10.0"))
+    LLM_HEDGE_ENABLED: bool = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+    LLM_HEDGE_DELAY_SECONDS: float = float(os.getenv("LLM_HEDGE_DELAY_SECONDS", "3.0"))
+    LLM_HEDGE_QUANTILE: float = 0.95
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    LLM_CIRCUIT_RESET_SECONDS: float = float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30.0"))
+    EMBEDDINGS_MODEL: str = os.getenv("EMBEDDINGS_MODEL", "all-MiniLM-L6-v2")
+    EMBEDDINGS_DIM: int = int(os.getenv("EMBEDDINGS_DIM", "384"))
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    EMBEDDING_STORE_ENABLED: bool = os.getenv("EMBEDDING_STORE_ENABLED", "true").lower() == "true"
+    EMBEDDING_STORE_DIR: str = os.getenv("EMBEDDING_STORE_DIR", "/app/data/embedding_store")
+    EMBEDDING_STORE_MAX_BYTES: int = int(os.getenv("EMBEDDING_STORE_MAX_BYTES", str(2 * 1024**3)))
+
+    UPLOADS_DIR: str = os.getenv("UPLOADS_DIR", "/app/uploads")
+
+    # IngestDocument RPC: upload is buffered in memory up to spool size, then in a temp file
+    INGEST_MAX_BYTES: int = int(os.getenv("INGEST_MAX_BYTES", str(100 * 1024**2)))
+    INGEST_SPOOL_MAX_BYTES: int = int(os.getenv("INGEST_SPOOL_MAX_BYTES", str(8 * 1024**2)))
+    INGEST_STREAM_CONCURRENCY: int = int(os.getenv("INGEST_STREAM_CONCURRENCY", "2"))
+    # Also save streamed uploads to tenant's uploads dir; re-index does not need
+    # them (rebuilds from parsed cache or stored chunks, see app/reindex.py)
+    INGEST_SAVE_UPLOADS: bool = os.getenv("INGEST_SAVE_UPLOADS", "false").lower() == "true"
+
+    # Tenant used when request or ingestion task carries no tenant_id
+    DEFAULT_TENANT: str = os.getenv("DEFAULT_TENANT", "default")
+    # Queries of tenant without collection skip Qdrant lookups for this long
+    TENANT_MISSING_TTL_SECONDS: float = float(os.getenv("TENANT_MISSING_TTL_SECONDS", "30"))
 
     GRPC_PORT: str = "[::]:50051"
+    # IngestDocument RPC is served by ingest-role workers only, on its own port
+    INGEST_GRPC_PORT: str = os.getenv("INGEST_GRPC_PORT", "[::]:50052")
+    METRICS_PORT: int = int(os.getenv("METRICS_PORT", "9090"))
+    # Bearer token for /debug/* endpoints of metrics server; empty disables them
+    DEBUG_TOKEN: str = os.getenv("DEBUG_TOKEN", "")
+    DEBUG_PROFILE_MAX_SECONDS: float = 60.0
+    # Supervised workers serve /debug/* on DEBUG_PORT_BASE + worker slot; 0 disables
+    DEBUG_PORT_BASE: int = int(os.getenv("DEBUG_PORT_BASE", "0"))
+    DEBUG_PORT: int = int(os.getenv("DEBUG_PORT", "0"))
+
+    LOOP_MONITOR_ENABLED: bool = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.5
+    # Loop not running for this long past its timer counts as a stall and logs blocking stack
+    LOOP_STALL_SECONDS: float = float(os.getenv("LOOP_STALL_SECONDS", "0.25"))
+
+    # all | query | ingest (see app/supervisor.py for multi-process mode)
+    SERVICE_ROLE: str = os.getenv("SERVICE_ROLE", "all")
+    SUPERVISED: bool = os.getenv("SUPERVISED", "false").lower() == "true"
+    QUERY_WORKERS: int = int(os.getenv("QUERY_WORKERS", str(os.cpu_count() or 1)))
+    INGEST_WORKERS: int = int(os.getenv("INGEST_WORKERS", "1"))
+    PROMETHEUS_MULTIPROC_DIR: str = os.getenv("PROMETHEUS_MULTIPROC_DIR", "/tmp/rag_metrics")
+    GRPC_MAX_CONCURRENT_RPCS: int = int(os.getenv("GRPC_MAX_CONCURRENT_RPCS", "32"))
+    GRPC_MAX_QUEUED_RPCS: int = int(os.getenv("GRPC_MAX_QUEUED_RPCS", "64"))
+    GRPC_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("GRPC_QUEUE_TIMEOUT_SECONDS", "2.0"))
+
+    EMBEDDING_TIMEOUT_SECONDS: float = float(os.getenv("EMBEDDING_TIMEOUT_SECONDS", "5.0"))
+    QDRANT_TIMEOUT_SECONDS: float = float(os.getenv("QDRANT_TIMEOUT_SECONDS", "2.0"))
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "30.0"))
 
-    CHUNK_SIZE_TOKENS: int = 256
-    CHUNK_OVERLAP_TOKENS: int = 100
+    # Once unsummarized history exceeds trigger, older turns are folded into a
+    # rolling summary sent instead of them; newest messages always stay verbatim
+    HISTORY_SUMMARY_ENABLED: bool = os.getenv("HISTORY_SUMMARY_ENABLED", "true").lower() == "true"
+    HISTORY_SUMMARY_TRIGGER_TOKENS: int = int(os.getenv("HISTORY_SUMMARY_TRIGGER_TOKENS", "1500"))
+    HISTORY_SUMMARY_KEEP_MESSAGES: int = int(os.getenv("HISTORY_SUMMARY_KEEP_MESSAGES", "4"))
+    HISTORY_SUMMARY_MAX_WORDS: int = 200
+    HISTORY_SUMMARY_MAX_MESSAGES: int = 100
+    HISTORY_SUMMARY_TIMEOUT_SECONDS: float = 60.0
+
+    SINGLEFLIGHT_ENABLED: bool = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+
+    CHUNK_SIZE_TOKENS: int = int(os.getenv("CHUNK_SIZE_TOKENS", "256"))
+    CHUNK_OVERLAP_TOKENS: int = int(os.getenv("CHUNK_OVERLAP_TOKENS", "100"))
     TIKTOKEN_ENCODING: str = "cl100k_base"
 
+    RETRIEVAL_TOP_K: int = int(os.getenv("RETRIEVAL_TOP_K", "3"))
+    # Candidates fetched with vectors before merging and MMR
+    RETRIEVAL_CANDIDATES: int = int(os.getenv("RETRIEVAL_CANDIDATES", "20"))
+    MMR_ENABLED: bool = os.getenv("MMR_ENABLED", "true").lower() == "true"
+    # 1.0 = pure relevance, 0.0 = pure diversity
+    MMR_LAMBDA: float = float(os.getenv("MMR_LAMBDA", "0.7"))
+    # chunk | small_to_big (expand hits with neighboring chunks of same page)
+    RETRIEVAL_MODE: str = os.getenv("RETRIEVAL_MODE", "small_to_big")
+    RETRIEVAL_EXPAND_CHUNKS: int = int(os.getenv("RETRIEVAL_EXPAND_CHUNKS", "2"))
+    # Token budget for all expanded passages, shared equally between them
+    RETRIEVAL_CONTEXT_TOKENS: int = int(os.getenv("RETRIEVAL_CONTEXT_TOKENS", "2048"))
+    # Adaptive depth (replaces RETRIEVAL_TOP_K): passages below floor are dropped and
+    # list is cut before first score drop wider than MAX_GAP, keeping MIN_K..MAX_K;
+    # top MIN_K passages survive the floor
+    RETRIEVAL_ADAPTIVE_ENABLED: bool = os.getenv("RETRIEVAL_ADAPTIVE_ENABLED", "true").lower() == "true"
+    RETRIEVAL_MIN_K: int = int(os.getenv("RETRIEVAL_MIN_K", "1"))
+    RETRIEVAL_MAX_K: int = int(os.getenv("RETRIEVAL_MAX_K", "6"))
+    RETRIEVAL_SCORE_FLOOR: float = float(os.getenv("RETRIEVAL_SCORE_FLOOR", "0.2"))
+    RETRIEVAL_MAX_GAP: float = float(os.getenv("RETRIEVAL_MAX_GAP", "0.1"))
+    # Best score below this answers "not found" without calling LLM
+    RETRIEVAL_MIN_CONFIDENCE: float = float(os.getenv("RETRIEVAL_MIN_CONFIDENCE", "0.3"))
+
+    PARSED_CACHE_ENABLED: bool = os.getenv("PARSED_CACHE_ENABLED", "true").lower() == "true"
+    PARSED_CACHE_DIR: str = os.getenv("PARSED_CACHE_DIR", "/app/data/parsed_cache")
+
     @property
     def database_url(self) -> str:
         """Build PostgreSQL connection string."""
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:5432/{self.DB_NAME}"
 
+    @property
+    def llm_endpoints(self) -> list[tuple[str, str]]:
+        """Ordered (model, base_url) pairs: primary first, then fallbacks."""
+        endpoints = [(self.LLM_MODEL, self.OPENAI_BASE_URL)]
+        for item in self.LLM_FALLBACK_ENDPOINTS.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            model, _, base_url = item.partition("@")
+            endpoints.append((model, base_url))
+        return endpoints
+
 
 settings = Settings()
@@ -1,8 +1,35 @@
 """Database connection and session management."""
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
-from app.models.chat import Base
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
+
+# Arbitrary key for pg_advisory_xact_lock held while migrating
+MIGRATION_LOCK_ID = 4815162342
+
+# Last revision equal to schema created by create_all before migrations existed
+BASELINE_REVISION = "0001"
+
+
+def _upgrade(connection) -> None:
+    """Apply migrations on sync connection, adopting pre-migration schemas."""
+    connection.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    config.attributes["connection"] = connection
+
+    inspector = inspect(connection)
+    if inspector.has_table("chat_sessions") and not inspector.has_table("alembic_version"):
+        command.stamp(config, BASELINE_REVISION)
+
+    command.upgrade(config, "head")
 
 
 class Database:
@@ -13,10 +40,10 @@ class Database:
         self.engine = create_async_engine(settings.database_url, echo=False)
         self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
 
-    async def create_tables(self) -> None:
-        """Create all database tables."""
+    async def migrate(self) -> None:
+        """Bring schema to latest migration."""
         async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_upgrade)
 
     async def close(self) -> None:
         """Close database connection."""
@@ -0,0 +1,24 @@
+"""Request deadline propagation."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class Deadline:
+    """Absolute deadline shared by all downstream calls of one request."""
+
+    def __init__(self, timeout: float | None = None) -> None:
+        """Start deadline from relative timeout in seconds (None means no deadline)."""
+        self.expires_at = time.monotonic() + timeout if timeout is not None else None
+
+    def remaining(self, cap: float | None = None) -> float | None:
+        """Get seconds left, capped by per-call timeout. Raises TimeoutError if expired."""
+        if self.expires_at is None:
+            return cap
+
+        left = self.expires_at - time.monotonic()
+        if left <= 0:
+            raise asyncio.TimeoutError("Request deadline exceeded")
+
+        return min(left, cap) if cap is not None else left
@@ -0,0 +1,98 @@
+"""Event-loop lag, stall and executor queue monitoring."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.core.metrics import (
+    EVENT_LOOP_LAG,
+    EVENT_LOOP_LAG_DISTRIBUTION,
+    EVENT_LOOP_STALLS,
+    EXECUTOR_QUEUE_DEPTH,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """Measure event loop scheduling lag and log what blocks the loop.
+
+    Lag is how late a timer fires. A watchdog thread notices when the loop
+    misses its timer by more than stall_threshold and logs the loop thread's
+    stack while it is still blocked, which names the offending coroutine.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.LOOP_MONITOR_INTERVAL_SECONDS,
+        stall_threshold: float = settings.LOOP_STALL_SECONDS,
+    ) -> None:
+        """Initialize monitor."""
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.executors: dict[str, ThreadPoolExecutor] = {}
+        self._thread_id: int | None = None
+        self._deadline = 0.0
+        self._tick = 0
+        self._reported_tick = -1
+        self._stop = threading.Event()
+
+    def watch_executor(self, name: str, executor: ThreadPoolExecutor) -> None:
+        """Report queue depth of executor."""
+        self.executors[name] = executor
+
+    async def run(self) -> None:
+        """Sample lag and executor queues until cancelled."""
+        self.loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        # Same threshold for asyncio's own slow callback warnings (PYTHONASYNCIODEBUG=1)
+        self.loop.slow_callback_duration = self.stall_threshold
+        self._deadline = time.monotonic() + self.interval + self.stall_threshold
+        self._stop.clear()
+        watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        watchdog.start()
+
+        try:
+            while True:
+                start = time.monotonic()
+                self._deadline = start + self.interval + self.stall_threshold
+                await asyncio.sleep(self.interval)
+                lag = max(time.monotonic() - start - self.interval, 0.0)
+                self._tick += 1
+
+                EVENT_LOOP_LAG.set(lag)
+                EVENT_LOOP_LAG_DISTRIBUTION.observe(lag)
+                for name, executor in self.executors.items():
+                    # ThreadPoolExecutor exposes no public queue size
+                    EXECUTOR_QUEUE_DEPTH.labels(executor=name).set(executor._work_queue.qsize())
+                if lag >= self.stall_threshold:
+                    logger.warning("Event loop was blocked for %.3fs", lag)
+        finally:
+            self._stop.set()
+
+    def _watch(self) -> None:
+        """Log stack of loop thread once per stall."""
+        while not self._stop.wait(self.stall_threshold / 4):
+            tick = self._tick
+            if time.monotonic() <= self._deadline or tick == self._reported_tick:
+                continue
+            self._reported_tick = tick
+            EVENT_LOOP_STALLS.inc()
+
+            frame = sys._current_frames().get(self._thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "(no frame)\n"
+            task = asyncio.current_task(self.loop)
+            logger.warning(
+                "Event loop blocked for over %.2fs, running task: %r\n%s",
+                self.stall_threshold, task, stack,
+            )
+
+
+loop_monitor = LoopMonitor()
@@ -1,9 +1,18 @@
 """Prometheus metrics."""
+import os
 import time
 from functools import wraps
 from typing import Callable
 
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
 
 REQUEST_COUNT = Counter(
     "rag_requests_total",
@@ -36,6 +45,202 @@ DOCUMENT_PROCESSED = Counter(
     ["status"],
 )
 
+GRPC_IN_FLIGHT = Gauge(
+    "rag_grpc_in_flight_requests",
+    "Number of gRPC requests currently being processed",
+    multiprocess_mode="livesum",
+)
+
+GRPC_QUEUED = Gauge(
+    "rag_grpc_queued_requests",
+    "Number of gRPC requests waiting for a free slot",
+    multiprocess_mode="livesum",
+)
+
+GRPC_REJECTED = Counter(
+    "rag_grpc_rejected_total",
+    "Total number of gRPC requests rejected by admission control",
+    ["reason"],
+)
+
+GRPC_CANCELLED = Counter(
+    "rag_grpc_cancelled_total",
+    "Total number of gRPC requests cancelled before completion",
+    ["reason"],
+)
+
+LLM_ATTEMPT_LATENCY = Histogram(
+    "rag_llm_attempt_latency_seconds",
+    "Latency of single LLM endpoint attempt in seconds",
+    ["endpoint", "kind", "outcome"],
+    buckets=[0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+)
+
+LLM_CIRCUIT_STATE = Gauge(
+    "rag_llm_circuit_state",
+    "LLM endpoint circuit breaker state (0=closed, 1=half-open, 2=open)",
+    ["endpoint"],
+    multiprocess_mode="livemax",
+)
+
+LLM_ENDPOINT_SKIPPED = Counter(
+    "rag_llm_endpoint_skipped_total",
+    "LLM endpoints skipped because circuit breaker is open",
+    ["endpoint"],
+)
+
+EMBEDDING_STORE_LOOKUPS = Counter(
+    "rag_embedding_store_lookups_total",
+    "Embedding store lookups by result",
+    ["result"],
+)
+
+EMBEDDING_STORE_COMPACTIONS = Counter(
+    "rag_embedding_store_compactions_total",
+    "Total number of embedding store compactions",
+)
+
+PARSED_CACHE_LOOKUPS = Counter(
+    "rag_parsed_cache_lookups_total",
+    "Parsed text cache lookups by result",
+    ["result"],
+)
+
+HISTORY_FETCH_LATENCY = Histogram(
+    "rag_history_fetch_seconds",
+    "Chat history fetch latency in seconds",
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5],
+)
+
+RETENTION_PARTITIONS_ARCHIVED = Counter(
+    "rag_retention_partitions_archived_total",
+    "Message partitions detached by retention job",
+)
+
+RETENTION_SESSIONS_DELETED = Counter(
+    "rag_retention_sessions_deleted_total",
+    "Expired chat sessions deleted by retention job",
+)
+
+SINGLEFLIGHT_REQUESTS = Counter(
+    "rag_singleflight_requests_total",
+    "Requests that started (leader) or joined (coalesced) a shared execution",
+    ["stage", "role"],
+)
+
+RETRIEVAL_CHUNKS = Counter(
+    "rag_retrieval_chunks_total",
+    "Retrieved candidate chunks by outcome after merging and MMR",
+    ["outcome"],
+)
+
+RETRIEVAL_DECISIONS = Counter(
+    "rag_retrieval_decisions_total",
+    "Retrieval policy decisions: generate, no_results or low_confidence (answered without LLM)",
+    ["decision"],
+)
+
+RETRIEVAL_DEPTH = Histogram(
+    "rag_retrieval_depth",
+    "Passages sent to LLM per request",
+    buckets=[0, 1, 2, 3, 4, 5, 6, 8, 10],
+)
+
+RETRIEVAL_TOP_SCORE = Histogram(
+    "rag_retrieval_top_score",
+    "Best passage score per request",
+    buckets=[0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0],
+)
+
+LLM_SECONDS_SAVED = Counter(
+    "rag_llm_seconds_saved_total",
+    "Estimated LLM latency avoided by answering without LLM",
+)
+
+TENANT_REQUESTS = Counter(
+    "rag_tenant_requests_total",
+    "Chat requests per tenant by status",
+    ["tenant", "status"],
+)
+
+TENANT_REQUEST_LATENCY = Histogram(
+    "rag_tenant_request_latency_seconds",
+    "Chat request latency per tenant in seconds",
+    ["tenant"],
+    buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+)
+
+TENANT_SEARCH_LATENCY = Histogram(
+    "rag_tenant_vector_search_seconds",
+    "Retrieval latency per tenant in seconds",
+    ["tenant"],
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0],
+)
+
+TENANT_DOCUMENTS = Counter(
+    "rag_tenant_documents_total",
+    "Ingested documents per tenant by status",
+    ["tenant", "status"],
+)
+
+TENANT_CHUNKS_INDEXED = Counter(
+    "rag_tenant_chunks_indexed_total",
+    "Chunks upserted to Qdrant per tenant",
+    ["tenant"],
+)
+
+INGEST_STREAM_BYTES = Counter(
+    "rag_ingest_stream_bytes_total",
+    "Bytes received by IngestDocument RPC",
+)
+
+HISTORY_PROMPT_TOKENS = Histogram(
+    "rag_history_prompt_tokens",
+    "History tokens sent to LLM per request (summary plus recent turns)",
+    buckets=[0, 100, 250, 500, 1000, 2000, 4000, 8000],
+)
+
+HISTORY_TOKENS_SAVED = Counter(
+    "rag_history_tokens_saved_total",
+    "Prompt tokens saved by sending conversation summary instead of older turns",
+)
+
+HISTORY_SUMMARY_UPDATES = Counter(
+    "rag_history_summary_updates_total",
+    "Background conversation summary updates by outcome",
+    ["outcome"],
+)
+
+HISTORY_SUMMARY_LATENCY = Histogram(
+    "rag_history_summary_seconds",
+    "Conversation summary update latency in seconds",
+    buckets=[0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0],
+)
+
+EVENT_LOOP_LAG = Gauge(
+    "rag_event_loop_lag_seconds",
+    "Latest event loop scheduling lag in seconds",
+    multiprocess_mode="livemax",
+)
+
+EVENT_LOOP_LAG_DISTRIBUTION = Histogram(
+    "rag_event_loop_lag_distribution_seconds",
+    "Event loop scheduling lag in seconds",
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0],
+)
+
+EVENT_LOOP_STALLS = Counter(
+    "rag_event_loop_stalls_total",
+    "Times event loop was blocked longer than stall threshold",
+)
+
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    "rag_executor_queue_depth",
+    "Work items waiting for free thread in executor",
+    ["executor"],
+    multiprocess_mode="livesum",
+)
+
 
 def track_latency(histogram: Histogram) -> Callable:
     """Decorator to track function latency."""
@@ -52,7 +257,11 @@ def track_latency(histogram: Histogram) -> Callable:
 
 
 def get_metrics() -> bytes:
-    """Generate Prometheus metrics output."""
+    """Generate Prometheus metrics output, aggregated across worker processes if enabled."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
     return generate_latest()
 
 
@@ -0,0 +1,94 @@
+"""HTTP server exposing Prometheus metrics and debug endpoints.
+
+With DEBUG_TOKEN set, requests with ``Authorization: Bearer <token>`` can use:
+
+- ``/debug/stacks``: stacks of all threads and asyncio tasks
+- ``/debug/profile?seconds=N``: sampling profile as folded stacks
+"""
+import hmac
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from urllib.parse import parse_qs, urlsplit
+
+from app.core.config import settings
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import get_content_type, get_metrics
+from app.core.profiling import sample_profile, task_stacks, thread_stacks
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_SECONDS = 10.0
+
+# One profile at a time: concurrent samplers would distort each other
+profile_lock = Lock()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """HTTP handler for Prometheus metrics and debug endpoints."""
+
+    def do_GET(self):
+        """Handle GET /metrics and /debug/*."""
+        url = urlsplit(self.path)
+        if url.path == "/metrics":
+            self.send_response(200)
+            self.send_header("Content-Type", get_content_type())
+            self.end_headers()
+            self.wfile.write(get_metrics())
+        elif url.path.startswith("/debug/") and settings.DEBUG_TOKEN:
+            self.handle_debug(url.path, parse_qs(url.query))
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def handle_debug(self, path: str, query: dict[str, list[str]]) -> None:
+        """Serve authenticated debug endpoint."""
+        expected = f"Bearer {settings.DEBUG_TOKEN}".encode()
+        if not hmac.compare_digest(self.headers.get("Authorization", "").encode(), expected):
+            self.send_text(401, "unauthorized\n")
+            return
+
+        if path == "/debug/stacks":
+            body = thread_stacks()
+            if loop_monitor.loop is not None:
+                body += "\n" + task_stacks(loop_monitor.loop)
+            self.send_text(200, body)
+        elif path == "/debug/profile":
+            try:
+                seconds = float(query.get("seconds", [DEFAULT_PROFILE_SECONDS])[0])
+            except ValueError:
+                self.send_text(400, "seconds must be a number\n")
+                return
+            seconds = min(max(seconds, 0.1), settings.DEBUG_PROFILE_MAX_SECONDS)
+            if not profile_lock.acquire(blocking=False):
+                self.send_text(409, "profile already running\n")
+                return
+            try:
+                logger.info("Profiling for %.1fs", seconds)
+                self.send_text(200, sample_profile(seconds))
+            finally:
+                profile_lock.release()
+        else:
+            self.send_text(404, "not found\n")
+
+    def send_text(self, status: int, body: str) -> None:
+        """Send plain text response."""
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Suppress HTTP logs."""
+        pass
+
+
+def start_metrics_server(port: int = settings.METRICS_PORT):
+    """Start metrics HTTP server in background. Threaded so profiling doesn't block scrapes."""
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    server.daemon_threads = True
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    logger.info("Metrics server started on port %d", port)
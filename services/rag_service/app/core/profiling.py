@@ -0,0 +1,75 @@
+"""Stack dumps and sampling profiler for metrics server debug endpoints."""
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+
+def thread_stacks() -> str:
+    """Current stack of every thread."""
+    names = {t.ident: t.name for t in threading.enumerate()}
+    parts = []
+    for ident, frame in sys._current_frames().items():
+        parts.append(f"Thread {names.get(ident, '?')} ({ident}):\n" + "".join(traceback.format_stack(frame)))
+    return "\n".join(parts)
+
+
+def task_stacks(loop: asyncio.AbstractEventLoop, timeout: float = 1.0) -> str:
+    """Stacks of all asyncio tasks, collected on the loop thread.
+
+    If the loop does not respond within timeout it is blocked; thread_stacks()
+    shows where.
+    """
+    async def collect() -> str:
+        out = io.StringIO()
+        tasks = asyncio.all_tasks()
+        out.write(f"{len(tasks)} asyncio tasks\n")
+        for task in tasks:
+            task.print_stack(file=out)
+        return out.getvalue()
+
+    future = asyncio.run_coroutine_threadsafe(collect(), loop)
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        return f"Event loop did not respond within {timeout:.1f}s, it is blocked\n"
+
+
+def _frame_name(frame) -> str:
+    """Function name with file and first line, stable across samples."""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_profile(seconds: float, interval: float = 0.01) -> str:
+    """Sample stacks of all other threads for given time.
+
+    Returns folded stacks ("thread;outer;...;inner count" per line, hottest
+    first), which flamegraph.pl and speedscope read directly.
+    """
+    own = threading.get_ident()
+    counts: Counter[str] = Counter()
+    deadline = time.monotonic() + seconds
+
+    while time.monotonic() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
@@ -0,0 +1,63 @@
+"""Single-flight coalescing of identical concurrent calls."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.core.metrics import SINGLEFLIGHT_REQUESTS
+
+
+class _Call:
+    """In-flight shared execution."""
+
+    def __init__(self, task: asyncio.Task) -> None:
+        """Wrap task with waiter counter."""
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Share one execution between concurrent callers with the same key."""
+
+    def __init__(self, name: str, enabled: bool = True) -> None:
+        """Initialize group. Name is used as metrics label."""
+        self.name = name
+        self.enabled = enabled
+        self._calls: dict[Hashable, _Call] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: float | None = None,
+    ) -> Any:
+        """Run fn once per key; concurrent callers await the same result.
+
+        Each caller waits with its own timeout. Shared execution is cancelled
+        only when every caller has gone away.
+        """
+        if not self.enabled:
+            return await asyncio.wait_for(fn(), timeout)
+
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            SINGLEFLIGHT_REQUESTS.labels(stage=self.name, role="leader").inc()
+        else:
+            SINGLEFLIGHT_REQUESTS.labels(stage=self.name, role="coalesced").inc()
+
+        call.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(call.task), timeout)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        """Drop finished call so next request starts fresh."""
+        if self._calls.get(key) is call:
+            del self._calls[key]
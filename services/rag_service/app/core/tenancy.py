@@ -0,0 +1,34 @@
+"""Tenant identifiers and per-tenant upload layout."""
+from __future__ import annotations
+
+import os
+import re
+
+from app.core.config import settings
+
+# Safe for file paths and Qdrant collection names; no "_" so versioned
+# collection names of different tenants can't collide
+TENANT_PATTERN = re.compile(r"^[a-z0-9][a-z0-9-]{0,62}$")
+
+# Uploads of non-default tenants live in UPLOADS_DIR/tenants/<tenant_id>
+TENANTS_SUBDIR = "tenants"
+
+
+class InvalidTenantError(ValueError):
+    """Tenant ID is malformed."""
+
+
+def resolve_tenant(tenant_id: str | None) -> str:
+    """Validate tenant ID from request; empty means default tenant."""
+    if not tenant_id:
+        return settings.DEFAULT_TENANT
+    if not TENANT_PATTERN.match(tenant_id):
+        raise InvalidTenantError(f"Invalid tenant_id: {tenant_id!r}")
+    return tenant_id
+
+
+def uploads_dir(tenant: str) -> str:
+    """Directory holding tenant's uploaded source files."""
+    if tenant == settings.DEFAULT_TENANT:
+        return settings.UPLOADS_DIR
+    return os.path.join(settings.UPLOADS_DIR, TENANTS_SUBDIR, tenant)
@@ -5,6 +5,7 @@ from app.crud.chat import (
     get_or_create_session,
     get_session,
     save_message,
+    update_summary,
 )
 
 __all__ = [
@@ -13,4 +14,5 @@ __all__ = [
     "get_or_create_session",
     "get_session",
     "save_message",
+    "update_summary",
 ]
@@ -2,54 +2,83 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 
+from app.core.config import settings
 from app.core.database import db
+from app.core.metrics import HISTORY_FETCH_LATENCY, track_latency
 from app.models.chat import ChatSession, Message
 
+# Messages are never older than their session; margin covers app/DB clock skew
+SESSION_CLOCK_SKEW = timedelta(hours=1)
 
-async def get_session(session_id: str) -> ChatSession | None:
-    """Get chat session by ID."""
+
+async def get_session(session_id: str, tenant: str | None = None) -> ChatSession | None:
+    """Get chat session by ID, optionally only if it belongs to tenant."""
     try:
         sid = uuid.UUID(session_id)
     except ValueError:
         return None
 
+    query = select(ChatSession).where(ChatSession.id == sid)
+    if tenant is not None:
+        query = query.where(ChatSession.tenant_id == tenant)
+
     async with db.get_session() as session:
-        result = await session.execute(
-            select(ChatSession).where(ChatSession.id == sid)
-        )
+        result = await session.execute(query)
         return result.scalar_one_or_none()
 
 
-async def create_session() -> ChatSession:
-    """Create new chat session."""
+async def create_session(tenant: str = settings.DEFAULT_TENANT) -> ChatSession:
+    """Create new chat session for tenant."""
     async with db.get_session() as session:
-        new_session = ChatSession()
+        new_session = ChatSession(tenant_id=tenant)
         session.add(new_session)
         await session.commit()
         await session.refresh(new_session)
         return new_session
 
 
-async def get_or_create_session(session_id: str | None) -> tuple[uuid.UUID, bool]:
-    """Get existing session or create new one. Returns (session_id, is_new)."""
+async def get_or_create_session(
+    session_id: str | None,
+    tenant: str = settings.DEFAULT_TENANT,
+) -> tuple[ChatSession, bool]:
+    """Get tenant's existing session or create new one. Returns (session, is_new)."""
     if session_id:
-        existing = await get_session(session_id)
+        existing = await get_session(session_id, tenant)
         if existing:
-            return existing.id, False
+            return existing, False
 
-    new_session = await create_session()
-    return new_session.id, True
+    new_session = await create_session(tenant)
+    return new_session, True
 
 
-async def get_messages(session_id: uuid.UUID, limit: int = 10) -> list[Message]:
-    """Get recent messages from session."""
+@track_latency(HISTORY_FETCH_LATENCY)
+async def get_messages(
+    session_id: uuid.UUID,
+    limit: int = 10,
+    after: datetime | None = None,
+) -> list[Message]:
+    """Get recent messages from session, optionally only those created after given time.
+
+    Lower bound on created_at lets Postgres prune partitions older than session.
+    """
+    if after is not None:
+        bound = Message.created_at > after
+    else:
+        session_start = (
+            select(ChatSession.created_at - SESSION_CLOCK_SKEW)
+            .where(ChatSession.id == session_id)
+            .scalar_subquery()
+        )
+        bound = Message.created_at >= session_start
+
     async with db.get_session() as session:
         result = await session.execute(
             select(Message)
-            .where(Message.session_id == session_id)
+            .where(Message.session_id == session_id, bound)
             .order_by(Message.created_at.desc())
             .limit(limit)
         )
@@ -66,3 +95,23 @@ async def save_message(session_id: uuid.UUID, role: str, content: str) -> Messag
         await session.commit()
         await session.refresh(msg)
         return msg
+
+
+async def update_summary(
+    session_id: uuid.UUID,
+    summary: str,
+    summarized_until: datetime,
+    previous_until: datetime | None,
+) -> bool:
+    """Store session summary unless another update replaced previous one meanwhile."""
+    async with db.get_session() as session:
+        result = await session.execute(
+            update(ChatSession)
+            .where(
+                ChatSession.id == session_id,
+                ChatSession.summarized_until.is_not_distinct_from(previous_until),
+            )
+            .values(summary=summary, summarized_until=summarized_until)
+        )
+        await session.commit()
+        return result.rowcount == 1
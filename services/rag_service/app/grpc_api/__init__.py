@@ -1,4 +1,5 @@
 """gRPC API package."""
+from app.grpc_api.admission import AdmissionController, AdmissionRejected
 from app.grpc_api.handler import RagServiceHandler
 
-__all__ = ["RagServiceHandler"]
+__all__ = ["AdmissionController", "AdmissionRejected", "RagServiceHandler"]
@@ -0,0 +1,64 @@
+"""Admission control for in-flight gRPC requests."""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.core.config import settings
+from app.core.metrics import GRPC_IN_FLIGHT, GRPC_QUEUED, GRPC_REJECTED
+
+
+class AdmissionRejected(Exception):
+    """Raised when request cannot be admitted."""
+
+
+class AdmissionController:
+    """Limit concurrent requests with bounded waiting queue."""
+
+    def __init__(
+        self,
+        max_concurrent: int = settings.GRPC_MAX_CONCURRENT_RPCS,
+        max_queued: int = settings.GRPC_MAX_QUEUED_RPCS,
+        queue_timeout: float = settings.GRPC_QUEUE_TIMEOUT_SECONDS,
+    ) -> None:
+        """Initialize limits. max_queued=0 rejects immediately when all slots are busy."""
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._queued = 0
+
+    @asynccontextmanager
+    async def slot(self, timeout: float | None = None) -> AsyncIterator[None]:
+        """Hold one request slot, waiting at most queue_timeout (or request timeout)."""
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+        else:
+            await self._wait_in_queue(timeout)
+
+        GRPC_IN_FLIGHT.inc()
+        try:
+            yield
+        finally:
+            GRPC_IN_FLIGHT.dec()
+            self._semaphore.release()
+
+    async def _wait_in_queue(self, timeout: float | None) -> None:
+        """Wait for free slot or reject if queue is full or wait times out."""
+        if self._queued >= self.max_queued:
+            GRPC_REJECTED.labels(reason="queue_full").inc()
+            raise AdmissionRejected("Too many requests in flight")
+
+        wait = self.queue_timeout if timeout is None else min(self.queue_timeout, timeout)
+
+        self._queued += 1
+        GRPC_QUEUED.inc()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), wait)
+        except asyncio.TimeoutError:
+            GRPC_REJECTED.labels(reason="queue_timeout").inc()
+            raise AdmissionRejected("Timed out waiting for free slot") from None
+        finally:
+            self._queued -= 1
+            GRPC_QUEUED.dec()
@@ -1,8 +1,18 @@
 """gRPC service handler."""
+import asyncio
+import hashlib
 import logging
+import os
+import tempfile
+from typing import AsyncIterator
 
 import grpc
 
+from app.core.config import settings
+from app.core.metrics import GRPC_CANCELLED, INGEST_STREAM_BYTES
+from app.core.tenancy import InvalidTenantError, resolve_tenant
+from app.grpc_api.admission import AdmissionController, AdmissionRejected
+from app.services.document_processor import SUPPORTED_EXTENSIONS, process_stream
 from app.services.rag import process_query
 from proto import rag_service_pb2, rag_service_pb2_grpc
 
@@ -13,34 +23,55 @@ logger = logging.getLogger(__name__)
 class RagServiceHandler(rag_service_pb2_grpc.RagServiceServicer):
     """gRPC handler for RAG service."""
 
+    def __init__(
+        self,
+        admission: AdmissionController | None = None,
+        query: bool = True,
+        ingest: bool = True,
+    ) -> None:
+        """Initialize handler with admission controller and RPCs this worker's role serves."""
+        self.admission = admission or AdmissionController()
+        self.query = query
+        self.ingest = ingest
+        self.ingest_slots = asyncio.Semaphore(settings.INGEST_STREAM_CONCURRENCY)
+
     async def GetAnswer(
         self,
         request: rag_service_pb2.ChatRequest,
         context: grpc.aio.ServicerContext,
     ) -> rag_service_pb2.ChatResponse:
         """Handle chat request."""
+        if not self.query:
+            await context.abort(grpc.StatusCode.UNIMPLEMENTED, "Queries are not served by ingest workers")
         query = request.message
         session_id = request.session_id if request.session_id else None
-
-        logger.info("Query: %s", query)
+        timeout = context.time_remaining()
 
         try:
-            result = await process_query(query, session_id)
+            tenant = resolve_tenant(request.tenant_id)
+        except InvalidTenantError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        logger.info("Query [%s]: %s", tenant, query)
 
-            sources = [
-                rag_service_pb2.Source(
-                    doc_name=s.doc_name,
-                    page=s.page,
-                    score=s.score,
+        try:
+            async with self.admission.slot(timeout):
+                result = await process_query(
+                    query, session_id, timeout=context.time_remaining(), tenant=tenant
                 )
-                for s in result.sources
-            ]
 
-            return rag_service_pb2.ChatResponse(
-                answer=result.answer,
-                sources=sources,
-                session_id=result.session_id,
-            )
+        except AdmissionRejected as e:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+
+        except asyncio.TimeoutError:
+            GRPC_CANCELLED.labels(reason="deadline_exceeded").inc()
+            logger.warning("Deadline exceeded for query: %s", query[:50])
+            await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, "Deadline exceeded")
+
+        except asyncio.CancelledError:
+            GRPC_CANCELLED.labels(reason="cancelled").inc()
+            logger.info("Request cancelled by client: %s", query[:50])
+            raise
 
         except Exception as e:
             logger.exception("RAG error: %s", e)
@@ -49,3 +80,91 @@ class RagServiceHandler(rag_service_pb2_grpc.RagServiceServicer):
                 sources=[],
                 session_id=session_id or "",
             )
+
+        sources = [
+            rag_service_pb2.Source(
+                doc_name=s.doc_name,
+                page=s.page,
+                score=s.score,
+            )
+            for s in result.sources
+        ]
+
+        return rag_service_pb2.ChatResponse(
+            answer=result.answer,
+            sources=sources,
+            session_id=result.session_id,
+        )
+
+    async def IngestDocument(
+        self,
+        request_iterator: AsyncIterator[rag_service_pb2.IngestChunk],
+        context: grpc.aio.ServicerContext,
+    ) -> rag_service_pb2.IngestResponse:
+        """Receive file chunks into spooled buffer, then parse and index it.
+
+        Served only by ingest-role workers, so parsing and embedding never
+        compete with queries for CPU.
+        """
+        if not self.ingest:
+            await context.abort(
+                grpc.StatusCode.UNIMPLEMENTED, "Ingestion is served on INGEST_GRPC_PORT by ingest workers"
+            )
+        spool = tempfile.SpooledTemporaryFile(max_size=settings.INGEST_SPOOL_MAX_BYTES)
+        digest = hashlib.sha256()
+        filename, tenant, received = None, None, 0
+
+        try:
+            async for chunk in request_iterator:
+                if filename is None:
+                    filename = os.path.basename(chunk.filename)
+                    if os.path.splitext(filename)[1].lower() not in SUPPORTED_EXTENSIONS:
+                        await context.abort(
+                            grpc.StatusCode.INVALID_ARGUMENT, f"Unsupported file: {chunk.filename!r}"
+                        )
+                    try:
+                        tenant = resolve_tenant(chunk.tenant_id)
+                    except InvalidTenantError as e:
+                        await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+                received += len(chunk.data)
+                if received > settings.INGEST_MAX_BYTES:
+                    await context.abort(
+                        grpc.StatusCode.RESOURCE_EXHAUSTED,
+                        f"File exceeds {settings.INGEST_MAX_BYTES} bytes",
+                    )
+                digest.update(chunk.data)
+                spool.write(chunk.data)
+                INGEST_STREAM_BYTES.inc(len(chunk.data))
+
+            if filename is None:
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Empty upload")
+
+            logger.info("Ingest [%s]: %s (%d bytes)", tenant, filename, received)
+            async with self.ingest_slots:
+                source, pages, chunks = await process_stream(spool, filename, digest.hexdigest(), tenant)
+
+        except grpc.aio.AbortError:
+            raise
+
+        except asyncio.CancelledError:
+            GRPC_CANCELLED.labels(reason="cancelled").inc()
+            logger.info("Upload cancelled by client: %s", filename)
+            raise
+
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        except Exception as e:
+            logger.exception("Ingestion error: %s", e)
+            await context.abort(grpc.StatusCode.INTERNAL, "Error processing document.")
+
+        finally:
+            spool.close()
+
+        return rag_service_pb2.IngestResponse(
+            doc_name=os.path.basename(source),
+            bytes_received=received,
+            pages=pages,
+            chunks=chunks,
+        )
@@ -0,0 +1,4 @@
+"""Embedding store infrastructure package."""
+from app.infrastructure.embedding_store.store import EmbeddingStore
+
+__all__ = ["EmbeddingStore"]
@@ -0,0 +1,245 @@
+"""Append-only, memory-mapped embedding store keyed by content hash."""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Sequence
+
+import numpy as np
+
+from app.core.metrics import EMBEDDING_STORE_COMPACTIONS, EMBEDDING_STORE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+KEY_SIZE = 16
+VECTORS_FILE = "vectors.f32"
+INDEX_FILE = "index.bin"
+META_FILE = "meta.json"
+LOCK_FILE = ".lock"
+
+# Compaction shrinks store to this fraction of max_bytes
+COMPACT_RATIO = 0.75
+
+
+class EmbeddingStore:
+    """On-disk float32 vectors for one embedding model, addressed by text hash.
+
+    Layout: ``vectors.f32`` holds rows of ``dim`` float32 values, ``index.bin``
+    holds one KEY_SIZE-byte key per row in the same order. Both are append-only
+    and only rewritten by compaction. Vectors are read through mmap, lookups
+    return views into the mapping. Writers from several processes are
+    serialized with flock.
+    """
+
+    def __init__(self, root: str, model_name: str, max_bytes: int) -> None:
+        """Open (or create) store for model under root directory."""
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+        self.path = os.path.join(root, re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name))
+        os.makedirs(self.path, exist_ok=True)
+
+        self.dim: int | None = None
+        self._rows: dict[bytes, int] = {}
+        self._index_rows = 0
+        self._index_inode: int | None = None
+        self._matrix: np.ndarray | None = None
+        self._touched: set[bytes] = set()
+        self._lock = threading.Lock()
+
+    def key(self, text: str) -> bytes:
+        """Content hash of text for this model."""
+        data = f"{self.model_name}\0{text}".encode("utf-8")
+        return hashlib.blake2b(data, digest_size=KEY_SIZE).digest()
+
+    def get_many(self, texts: Sequence[str]) -> list[np.ndarray | None]:
+        """Look up vectors for texts. Missing entries are None."""
+        result: list[np.ndarray | None] = []
+        hits = 0
+        with self._lock:
+            with self._file_lock(fcntl.LOCK_SH):
+                self._refresh()
+
+            for text in texts:
+                key = self.key(text)
+                row = self._rows.get(key)
+                if row is None or self._matrix is None or row >= len(self._matrix):
+                    result.append(None)
+                    continue
+                self._touched.add(key)
+                result.append(self._matrix[row])
+                hits += 1
+
+        EMBEDDING_STORE_LOOKUPS.labels(result="hit").inc(hits)
+        EMBEDDING_STORE_LOOKUPS.labels(result="miss").inc(len(texts) - hits)
+        return result
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Append vectors for texts not yet stored. Compacts when over size limit."""
+        if not texts:
+            return
+
+        with self._lock, self._file_lock(fcntl.LOCK_EX):
+            self._refresh()
+
+            new_keys: list[bytes] = []
+            new_vectors: list[Sequence[float]] = []
+            seen: set[bytes] = set()
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                if key in self._rows or key in seen:
+                    continue
+                seen.add(key)
+                new_keys.append(key)
+                new_vectors.append(vector)
+
+            if not new_keys:
+                return
+
+            matrix = np.asarray(new_vectors, dtype=np.float32)
+            if self.dim is None:
+                self._write_meta(matrix.shape[1])
+            if matrix.shape[1] != self.dim:
+                raise ValueError(f"Vector size {matrix.shape[1]} does not match store size {self.dim}")
+
+            self._repair_tail()
+            with open(self._file(VECTORS_FILE), "ab") as f:
+                f.write(matrix.tobytes())
+            # Index is written after vectors so every indexed row is complete
+            with open(self._file(INDEX_FILE), "ab") as f:
+                f.write(b"".join(new_keys))
+
+            self._refresh()
+            if self._row_bytes * self._index_rows > self.max_bytes:
+                self._compact()
+
+    def compact(self) -> None:
+        """Rewrite store keeping recently used entries within size budget."""
+        with self._lock, self._file_lock(fcntl.LOCK_EX):
+            self._refresh()
+            self._compact()
+
+    def size_bytes(self) -> int:
+        """Get size of vectors file in bytes."""
+        try:
+            return os.path.getsize(self._file(VECTORS_FILE))
+        except FileNotFoundError:
+            return 0
+
+    @property
+    def _row_bytes(self) -> int:
+        """Bytes per stored vector."""
+        return (self.dim or 0) * 4
+
+    def _file(self, name: str) -> str:
+        """Path of store file."""
+        return os.path.join(self.path, name)
+
+    @contextmanager
+    def _file_lock(self, mode: int) -> Iterator[None]:
+        """Hold inter-process lock on store directory."""
+        with open(self._file(LOCK_FILE), "a") as f:
+            fcntl.flock(f, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _write_meta(self, dim: int) -> None:
+        """Persist vector size on first write."""
+        tmp = self._file(META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"model": self.model_name, "dim": dim}, f)
+        os.replace(tmp, self._file(META_FILE))
+        self.dim = dim
+
+    def _refresh(self) -> None:
+        """Pick up rows appended (or compaction done) by any process. Caller holds file lock."""
+        if self.dim is None:
+            try:
+                with open(self._file(META_FILE)) as f:
+                    self.dim = int(json.load(f)["dim"])
+            except FileNotFoundError:
+                return
+
+        try:
+            index_stat = os.stat(self._file(INDEX_FILE))
+        except FileNotFoundError:
+            return
+
+        if index_stat.st_ino != self._index_inode:
+            self._rows = {}
+            self._index_rows = 0
+            self._index_inode = index_stat.st_ino
+            self._matrix = None
+
+        total_rows = index_stat.st_size // KEY_SIZE
+        if total_rows > self._index_rows:
+            with open(self._file(INDEX_FILE), "rb") as f:
+                f.seek(self._index_rows * KEY_SIZE)
+                data = f.read((total_rows - self._index_rows) * KEY_SIZE)
+            for i in range(len(data) // KEY_SIZE):
+                self._rows[data[i * KEY_SIZE:(i + 1) * KEY_SIZE]] = self._index_rows + i
+            self._index_rows += len(data) // KEY_SIZE
+
+        if self._matrix is None or len(self._matrix) < self._index_rows:
+            self._remap()
+
+    def _remap(self) -> None:
+        """Map vectors file read-only. Old mapping is released when no views remain."""
+        with open(self._file(VECTORS_FILE), "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            rows = min(size // self._row_bytes, self._index_rows)
+            if rows == 0:
+                self._matrix = None
+                return
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._matrix = np.frombuffer(mapped, dtype=np.float32, count=rows * self.dim).reshape(rows, self.dim)
+
+    def _repair_tail(self) -> None:
+        """Drop partially written rows left by crashed writer. Caller holds exclusive lock."""
+        vectors_path = self._file(VECTORS_FILE)
+        index_path = self._file(INDEX_FILE)
+        vector_size = os.path.getsize(vectors_path) if os.path.exists(vectors_path) else 0
+        index_size = os.path.getsize(index_path) if os.path.exists(index_path) else 0
+
+        rows = min(vector_size // self._row_bytes, index_size // KEY_SIZE)
+        if vector_size != rows * self._row_bytes:
+            os.truncate(vectors_path, rows * self._row_bytes)
+        if index_size != rows * KEY_SIZE:
+            os.truncate(index_path, rows * KEY_SIZE)
+
+    def _compact(self) -> None:
+        """Rewrite files with deduplicated, recently used entries. Caller holds exclusive lock."""
+        if self._matrix is None:
+            return
+
+        budget = int(self.max_bytes * COMPACT_RATIO) // self._row_bytes
+        live = sorted(
+            ((row, key) for key, row in self._rows.items() if row < len(self._matrix)),
+            key=lambda item: (item[1] in self._touched, item[0]),
+            reverse=True,
+        )
+        keep = sorted(live[:budget])
+        rows = np.fromiter((row for row, _ in keep), dtype=np.int64, count=len(keep))
+
+        with open(self._file(VECTORS_FILE + ".tmp"), "wb") as f:
+            f.write(self._matrix[rows].tobytes())
+        with open(self._file(INDEX_FILE + ".tmp"), "wb") as f:
+            f.write(b"".join(key for _, key in keep))
+        os.replace(self._file(VECTORS_FILE + ".tmp"), self._file(VECTORS_FILE))
+        os.replace(self._file(INDEX_FILE + ".tmp"), self._file(INDEX_FILE))
+
+        EMBEDDING_STORE_COMPACTIONS.inc()
+        logger.info(
+            "Compacted embedding store %s: %d -> %d vectors",
+            self.path, self._index_rows, len(keep),
+        )
+        self._touched.clear()
+        self._refresh()
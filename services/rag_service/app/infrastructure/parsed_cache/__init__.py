@@ -0,0 +1,4 @@
+"""Parsed text cache infrastructure package."""
+from app.infrastructure.parsed_cache.store import ParsedTextCache
+
+__all__ = ["ParsedTextCache"]
@@ -0,0 +1,68 @@
+"""On-disk cache of text extracted from source files."""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import tempfile
+
+from langchain_core.documents import Document
+
+from app.core.metrics import PARSED_CACHE_LOOKUPS
+
+
+class ParsedTextCache:
+    """Page-segmented extracted text keyed by file content hash and loader version.
+
+    Each entry is a gzip-compressed JSON file with one item per page/section.
+    ``source`` metadata is not stored: the same content may live under
+    different paths, so it is restored from the current path on load.
+    """
+
+    def __init__(self, root: str, loader_version: int) -> None:
+        """Initialize cache directory."""
+        self.root = root
+        self.loader_version = loader_version
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, file_hash: str) -> str:
+        """Get entry path for file hash."""
+        return os.path.join(self.root, file_hash[:2], f"{file_hash}.v{self.loader_version}.json.gz")
+
+    def get(self, file_hash: str, source: str) -> list[Document] | None:
+        """Load cached pages, or None on miss."""
+        try:
+            with gzip.open(self._path(file_hash), "rt", encoding="utf-8") as f:
+                pages = json.load(f)
+        except (FileNotFoundError, OSError, ValueError):
+            PARSED_CACHE_LOOKUPS.labels(result="miss").inc()
+            return None
+
+        PARSED_CACHE_LOOKUPS.labels(result="hit").inc()
+        return [
+            Document(page_content=p["text"], metadata={**p["metadata"], "source": source})
+            for p in pages
+        ]
+
+    def put(self, file_hash: str, documents: list[Document]) -> None:
+        """Store extracted pages atomically."""
+        path = self._path(file_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        pages = [
+            {
+                "text": doc.page_content,
+                "metadata": {k: v for k, v in doc.metadata.items() if k != "source"},
+            }
+            for doc in documents
+        ]
+
+        # Unique temp file: threads of one process may store the same key concurrently
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix=".tmp", delete=False) as raw:
+            try:
+                with gzip.open(raw, "wt", encoding="utf-8", compresslevel=6) as f:
+                    json.dump(pages, f, ensure_ascii=False, separators=(",", ":"), default=str)
+            except BaseException:
+                os.unlink(raw.name)
+                raise
+        os.replace(raw.name, path)
@@ -1,9 +1,25 @@
 """Qdrant vector database client."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Payload fields identifying chunk position, as written by langchain Qdrant store
+PAYLOAD_INDEXES = {
+    "metadata.source": models.PayloadSchemaType.KEYWORD,
+    "metadata.page": models.PayloadSchemaType.INTEGER,
+    "metadata.chunk_index": models.PayloadSchemaType.INTEGER,
+}
+
 
 class QdrantService:
     """Async Qdrant client wrapper."""
@@ -15,6 +31,9 @@ class QdrantService:
         self.grpc_port = settings.QDRANT_GRPC_PORT
         self.prefer_grpc = settings.QDRANT_PREFER_GRPC
         self.collection = settings.QDRANT_COLLECTION
+        self._ready_tenants: set[str] = set()
+        # Tenant -> monotonic time until which it is known to have no collection
+        self._missing_tenants: dict[str, float] = {}
 
     def get_client(self) -> AsyncQdrantClient:
         """Create new client instance."""
@@ -25,47 +44,274 @@ class QdrantService:
             prefer_grpc=self.prefer_grpc,
         )
 
-    async def init_collection(self) -> None:
-        """Create collection if not exists."""
+    def collection_for(self, tenant: str | None = None) -> str:
+        """Alias of tenant's collection; default tenant uses QDRANT_COLLECTION."""
+        if tenant is None or tenant == settings.DEFAULT_TENANT:
+            return self.collection
+        return f"{self.collection}_t_{tenant}"
+
+    def versioned_name(self, tenant: str | None = None) -> str:
+        """Build name for new physical collection behind tenant's alias."""
+        return f"{self.collection_for(tenant)}_{time.strftime('%Y%m%d%H%M%S')}"
+
+    async def resolve_collection(self, tenant: str | None = None) -> str | None:
+        """Physical collection serving tenant: legacy collection or alias target."""
+        alias = self.collection_for(tenant)
         client = self.get_client()
         try:
             collections = await client.get_collections()
-            exists = any(c.name == self.collection for c in collections.collections)
-            if not exists:
-                await client.create_collection(
-                    collection_name=self.collection,
-                    vectors_config=models.VectorParams(
-                        size=384,
-                        distance=models.Distance.COSINE,
-                    ),
+            if any(c.name == alias for c in collections.collections):
+                return alias
+        finally:
+            await client.close()
+        return await self.get_alias_target(tenant)
+
+    async def init_collection(self, tenant: str | None = None) -> None:
+        """Create tenant's versioned collection and alias if neither exists.
+
+        A legacy physical collection named like the alias is used as is until
+        the first re-index replaces it.
+        """
+        target = await self.resolve_collection(tenant)
+        if target is not None:
+            await self.ensure_payload_indexes(target)
+            return
+
+        name = self.versioned_name(tenant)
+        try:
+            await self.create_collection(name)
+            await self.swap_alias(name, tenant)
+        except Exception:
+            # Another worker may have created it concurrently
+            if await self.resolve_collection(tenant) is None:
+                raise
+
+    async def tenant_ready(self, tenant: str, create: bool = False) -> bool:
+        """Check that tenant's collection exists, optionally creating it.
+
+        Cached once true; a missing collection is cached for TENANT_MISSING_TTL_SECONDS,
+        since another process may create it.
+        """
+        if tenant in self._ready_tenants:
+            return True
+        if create:
+            await self.init_collection(tenant)
+        else:
+            if self._missing_tenants.get(tenant, 0.0) > time.monotonic():
+                return False
+            if await self.resolve_collection(tenant) is None:
+                self._missing_tenants[tenant] = time.monotonic() + settings.TENANT_MISSING_TTL_SECONDS
+                return False
+        self._missing_tenants.pop(tenant, None)
+        self._ready_tenants.add(tenant)
+        return True
+
+    async def create_collection(
+        self,
+        name: str,
+        size: int = settings.EMBEDDINGS_DIM,
+        defer_indexing: bool = False,
+    ) -> None:
+        """Create physical collection. Deferred indexing speeds up bulk loads."""
+        client = self.get_client()
+        try:
+            await client.create_collection(
+                collection_name=name,
+                vectors_config=models.VectorParams(
+                    size=size,
+                    distance=models.Distance.COSINE,
+                ),
+                optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0)
+                if defer_indexing
+                else None,
+            )
+        finally:
+            await client.close()
+        await self.ensure_payload_indexes(name)
+
+    async def ensure_payload_indexes(self, name: str) -> None:
+        """Create payload indexes used for neighbor lookups (no-op if they exist)."""
+        client = self.get_client()
+        try:
+            for field, schema in PAYLOAD_INDEXES.items():
+                await client.create_payload_index(
+                    collection_name=name,
+                    field_name=field,
+                    field_schema=schema,
                 )
         finally:
             await client.close()
 
-    async def search(self, query_vector: list[float], limit: int = 3) -> list[dict]:
-        """Search similar documents."""
+    async def enable_indexing(self, name: str, poll_interval: float = 2.0) -> None:
+        """Restore indexing threshold after bulk load and wait until index is built."""
+        client = self.get_client()
+        try:
+            await client.update_collection(
+                collection_name=name,
+                optimizers_config=models.OptimizersConfigDiff(
+                    indexing_threshold=settings.QDRANT_INDEXING_THRESHOLD,
+                ),
+            )
+            while True:
+                info = await client.get_collection(name)
+                if info.status == models.CollectionStatus.GREEN:
+                    return
+                if info.status == models.CollectionStatus.RED:
+                    raise RuntimeError(f"Collection {name} failed to optimize")
+                await asyncio.sleep(poll_interval)
+        finally:
+            await client.close()
+
+    async def count(self, name: str | None = None) -> int:
+        """Exact number of points in collection (or alias)."""
+        client = self.get_client()
+        try:
+            result = await client.count(collection_name=name or self.collection, exact=True)
+            return result.count
+        finally:
+            await client.close()
+
+    async def get_alias_target(self, tenant: str | None = None) -> str | None:
+        """Get physical collection tenant's alias currently points to."""
+        alias_name = self.collection_for(tenant)
+        client = self.get_client()
+        try:
+            aliases = await client.get_aliases()
+            for alias in aliases.aliases:
+                if alias.alias_name == alias_name:
+                    return alias.collection_name
+            return None
+        finally:
+            await client.close()
+
+    async def swap_alias(self, name: str, tenant: str | None = None) -> None:
+        """Atomically point tenant's alias to collection.
+
+        A legacy physical collection with the alias name is dropped first,
+        which is the only step with a short window of unavailability.
+        """
+        alias = self.collection_for(tenant)
+        client = self.get_client()
+        try:
+            collections = await client.get_collections()
+            if any(c.name == alias for c in collections.collections):
+                logger.warning("Dropping legacy collection %s to create alias", alias)
+                await client.delete_collection(alias)
+
+            operations = []
+            if await self.get_alias_target(tenant) is not None:
+                operations.append(models.DeleteAliasOperation(
+                    delete_alias=models.DeleteAlias(alias_name=alias),
+                ))
+            operations.append(models.CreateAliasOperation(
+                create_alias=models.CreateAlias(collection_name=name, alias_name=alias),
+            ))
+            await client.update_collection_aliases(change_aliases_operations=operations)
+        finally:
+            await client.close()
+
+    async def drop_collection(self, name: str) -> None:
+        """Delete physical collection."""
         client = self.get_client()
         try:
-            result = await client.query_points(
-                collection_name=self.collection,
-                query=query_vector,
-                limit=limit,
-                with_payload=True,
+            await client.delete_collection(name)
+        finally:
+            await client.close()
+
+    async def search(
+        self,
+        query_vector: list[float],
+        limit: int = 3,
+        timeout: float | None = None,
+        with_vectors: bool = False,
+        tenant: str | None = None,
+    ) -> list[dict]:
+        """Search similar documents in tenant's collection, optionally returning stored vectors."""
+        client = self.get_client()
+        try:
+            result = await asyncio.wait_for(
+                client.query_points(
+                    collection_name=self.collection_for(tenant),
+                    query=query_vector,
+                    limit=limit,
+                    with_payload=True,
+                    with_vectors=with_vectors,
+                    timeout=math.ceil(timeout) if timeout is not None else None,
+                ),
+                timeout,
             )
             results = []
             for p in result.points:
-                payload = p.payload or {}
-                meta = payload.get("metadata", {})
-                results.append({
-                    "source": meta.get("source", payload.get("source", "unknown")),
-                    "page": meta.get("page", payload.get("page", 0)),
-                    "content": payload.get("page_content", ""),
-                    "score": p.score or 0.0,
-                })
+                item = self._to_result(p.payload)
+                item["score"] = p.score or 0.0
+                if with_vectors:
+                    item["vector"] = p.vector
+                results.append(item)
             return results
         finally:
             await client.close()
 
+    async def fetch_chunks(
+        self,
+        ranges: list[tuple[str, int, int, int]],
+        timeout: float | None = None,
+        tenant: str | None = None,
+    ) -> list[dict]:
+        """Fetch chunks by (source, page, first_chunk_index, last_chunk_index) in one scroll."""
+        if not ranges:
+            return []
+
+        conditions = [
+            models.Filter(must=[
+                models.FieldCondition(key="metadata.source", match=models.MatchValue(value=source)),
+                self._page_condition(page),
+                models.FieldCondition(key="metadata.chunk_index", range=models.Range(gte=first, lte=last)),
+            ])
+            for source, page, first, last in ranges
+        ]
+        limit = sum(last - first + 1 for _, _, first, last in ranges)
+
+        client = self.get_client()
+        try:
+            points, _ = await asyncio.wait_for(
+                client.scroll(
+                    collection_name=self.collection_for(tenant),
+                    scroll_filter=models.Filter(should=conditions),
+                    limit=limit,
+                    with_payload=True,
+                    with_vectors=False,
+                    timeout=math.ceil(timeout) if timeout is not None else None,
+                ),
+                timeout,
+            )
+            return [self._to_result(p.payload) for p in points]
+        finally:
+            await client.close()
+
+    @staticmethod
+    def _page_condition(page: int) -> models.Condition:
+        """Match page; page 0 also matches points stored without page (older TXT/DOCX uploads)."""
+        condition = models.FieldCondition(key="metadata.page", match=models.MatchValue(value=page))
+        if page != 0:
+            return condition
+        return models.Filter(should=[
+            condition,
+            models.IsEmptyCondition(is_empty=models.PayloadField(key="metadata.page")),
+        ])
+
+    @staticmethod
+    def _to_result(payload: dict | None) -> dict:
+        """Flatten stored payload into result dict."""
+        payload = payload or {}
+        meta = payload.get("metadata", {})
+        return {
+            "source": meta.get("source", payload.get("source", "unknown")),
+            "page": meta.get("page", payload.get("page", 0)),
+            "chunk_index": meta.get("chunk_index"),
+            "token_count": meta.get("token_count"),
+            "content": payload.get("page_content", ""),
+        }
+
     @property
     def url(self) -> str:
         """Get HTTP URL for Qdrant."""
@@ -7,6 +7,7 @@ from aio_pika import connect_robust
 from aio_pika.abc import AbstractIncomingMessage
 
 from app.core.config import settings
+from app.core.tenancy import resolve_tenant
 from app.services.document_processor import process_document
 
 logger = logging.getLogger(__name__)
@@ -19,9 +20,10 @@ async def process_task(message: AbstractIncomingMessage) -> None:
             data = json.loads(message.body.decode())
             task_id = data.get("task_id", "unknown")
             file_path = data.get("file_path", "")
+            tenant = resolve_tenant(data.get("tenant_id"))
 
-            logger.info("Processing task %s: %s", task_id, file_path)
-            await process_document(file_path)
+            logger.info("Processing task %s for tenant %s: %s", task_id, tenant, file_path)
+            await process_document(file_path, tenant)
             logger.info("Task %s completed", task_id)
 
         except Exception as e:
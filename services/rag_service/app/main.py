@@ -1,80 +1,88 @@
 """RAG Service entry point."""
 import asyncio
 import logging
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 
 import grpc
 
 
 from app.core.config import settings
 from app.core.database import db
-from app.core.metrics import get_content_type, get_metrics
-from app.grpc_api import RagServiceHandler
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics_server import start_metrics_server
+from app.grpc_api import AdmissionController, RagServiceHandler
 from app.infrastructure.qdrant import qdrant_service
 from app.infrastructure.rabbitmq import start_consumer
+from app.services.retention import retention_loop
 from proto import rag_service_pb2_grpc
 
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    format="%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
 
-METRICS_PORT = 9090
+QUERY_ROLES = {"all", "query"}
+INGEST_ROLES = {"all", "ingest"}
 
 
-class MetricsHandler(BaseHTTPRequestHandler):
-    """HTTP handler for Prometheus metrics."""
+async def start_grpc_server(query: bool, ingest: bool) -> grpc.aio.Server:
+    """Start gRPC server for worker's roles. Ports are shared between worker processes via SO_REUSEPORT."""
+    server = grpc.aio.server(options=[("grpc.so_reuseport", 1)])
+    rag_service_pb2_grpc.add_RagServiceServicer_to_server(
+        RagServiceHandler(AdmissionController(), query=query, ingest=ingest), server
+    )
+    ports = ([settings.GRPC_PORT] if query else []) + ([settings.INGEST_GRPC_PORT] if ingest else [])
+    for port in ports:
+        server.add_insecure_port(port)
+    logger.info("gRPC server started on %s", ", ".join(ports))
 
-    def do_GET(self):
-        """Handle GET /metrics."""
-        if self.path == "/metrics":
-            self.send_response(200)
-            self.send_header("Content-Type", get_content_type())
-            self.end_headers()
-            self.wfile.write(get_metrics())
-        else:
-            self.send_response(404)
-            self.end_headers()
+    await server.start()
+    return server
 
-    def log_message(self, format, *args):
-        """Suppress HTTP logs."""
-        pass
 
+async def serve() -> None:
+    """Start gRPC server and RabbitMQ consumer according to SERVICE_ROLE."""
+    role = settings.SERVICE_ROLE
+    if role not in QUERY_ROLES | INGEST_ROLES:
+        raise ValueError(f"Unknown service role: {role}")
+
+    # Explicit default executor so its queue depth can be monitored
+    executor = ThreadPoolExecutor(thread_name_prefix="rag-executor")
+    asyncio.get_running_loop().set_default_executor(executor)
+    loop_monitor.watch_executor("default", executor)
 
-def start_metrics_server():
-    """Start metrics HTTP server in background."""
-    server = HTTPServer(("0.0.0.0", METRICS_PORT), MetricsHandler)
-    thread = Thread(target=server.serve_forever, daemon=True)
-    thread.start()
-    logger.info("Metrics server started on port %d", METRICS_PORT)
+    # Supervisor serves aggregated metrics and initializes storage once
+    if settings.SUPERVISED:
+        if settings.DEBUG_PORT:
+            start_metrics_server(settings.DEBUG_PORT)
+    else:
+        start_metrics_server()
 
+        logger.info("Connecting to PostgreSQL...")
+        await db.migrate()
+        logger.info("Database ready")
 
-async def serve() -> None:
-    """Start gRPC server and RabbitMQ consumer."""
-    start_metrics_server()
+        logger.info("Initializing Qdrant...")
+        await qdrant_service.init_collection()
+        logger.info("Qdrant ready")
 
-    logger.info("Connecting to PostgreSQL...")
-    await db.create_tables()
-    logger.info("Database ready")
+    logger.info("Starting role: %s", role)
+    server = await start_grpc_server(query=role in QUERY_ROLES, ingest=role in INGEST_ROLES)
+    tasks = [server.wait_for_termination()]
 
-    logger.info("Initializing Qdrant...")
-    await qdrant_service.init_collection()
-    logger.info("Qdrant ready")
+    if role in INGEST_ROLES:
+        tasks.append(start_consumer())
 
-    server = grpc.aio.server()
-    rag_service_pb2_grpc.add_RagServiceServicer_to_server(RagServiceHandler(), server)
-    server.add_insecure_port(settings.GRPC_PORT)
-    logger.info("gRPC server started on %s", settings.GRPC_PORT)
+    # Supervised workers leave retention to the supervisor
+    if settings.MESSAGE_RETENTION_ENABLED and not settings.SUPERVISED:
+        tasks.append(retention_loop())
 
-    await server.start()
+    if settings.LOOP_MONITOR_ENABLED:
+        tasks.append(loop_monitor.run())
 
     try:
-        await asyncio.gather(
-            server.wait_for_termination(),
-            start_consumer(),
-        )
+        await asyncio.gather(*tasks)
     except asyncio.CancelledError:
         await server.stop(0)
     finally:
@@ -0,0 +1 @@
+"""Database migrations package."""
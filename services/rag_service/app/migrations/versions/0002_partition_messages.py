@@ -0,0 +1,77 @@
+"""Partition messages by month and index history lookups.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Rebuild messages as range-partitioned table with (session_id, created_at) index."""
+    op.execute("ALTER TABLE messages RENAME TO messages_legacy")
+    op.execute("""
+        CREATE TABLE messages (
+            id UUID NOT NULL,
+            session_id UUID NOT NULL REFERENCES chat_sessions (id) ON DELETE CASCADE,
+            role VARCHAR(20) NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE INDEX ix_messages_session_created ON messages (session_id, created_at)")
+    op.execute("CREATE TABLE messages_default PARTITION OF messages DEFAULT")
+
+    # Monthly partitions from oldest existing message to three months ahead
+    op.execute("""
+        DO $$
+        DECLARE
+            month_start DATE := date_trunc(
+                'month', COALESCE((SELECT min(created_at) FROM messages_legacy), now())
+            )::date;
+            last_month DATE := (date_trunc('month', now()) + interval '3 months')::date;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF messages FOR VALUES FROM (%L) TO (%L)',
+                    'messages_p' || to_char(month_start, 'YYYYMM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+
+    op.execute("""
+        INSERT INTO messages (id, session_id, role, content, created_at)
+        SELECT id, session_id, role, content, created_at FROM messages_legacy
+    """)
+    op.execute("DROP TABLE messages_legacy")
+    op.execute("CREATE INDEX ix_chat_sessions_created_at ON chat_sessions (created_at)")
+
+
+def downgrade() -> None:
+    """Convert back to plain messages table."""
+    op.execute("DROP INDEX ix_chat_sessions_created_at")
+    op.execute("ALTER TABLE messages RENAME TO messages_partitioned")
+    op.execute("""
+        CREATE TABLE messages (
+            id UUID PRIMARY KEY,
+            session_id UUID NOT NULL REFERENCES chat_sessions (id) ON DELETE CASCADE,
+            role VARCHAR(20) NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        INSERT INTO messages (id, session_id, role, content, created_at)
+        SELECT id, session_id, role, content, created_at FROM messages_partitioned
+    """)
+    op.execute("DROP TABLE messages_partitioned")
@@ -0,0 +1,28 @@
+"""Add tenant to chat sessions.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add tenant_id; existing sessions belong to DEFAULT_TENANT at migration time."""
+    op.add_column(
+        "chat_sessions",
+        sa.Column("tenant_id", sa.String(64), server_default=settings.DEFAULT_TENANT, nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Drop tenant_id."""
+    op.drop_column("chat_sessions", "tenant_id")
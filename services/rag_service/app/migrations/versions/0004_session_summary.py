@@ -0,0 +1,28 @@
+"""Add rolling conversation summary to chat sessions.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add summary and timestamp of last message it covers."""
+    op.add_column("chat_sessions", sa.Column("summary", sa.Text(), nullable=True))
+    op.add_column(
+        "chat_sessions",
+        sa.Column("summarized_until", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Drop summary columns."""
+    op.drop_column("chat_sessions", "summarized_until")
+    op.drop_column("chat_sessions", "summary")
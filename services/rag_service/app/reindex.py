@@ -0,0 +1,358 @@
+"""Blue-green re-index: rebuild collection in parallel and switch alias.
+
+Run with ``python -m app.reindex [--tenant ID]``. Builds a new versioned
+collection from all tenant's uploaded files and streamed documents using a
+process pool, bulk-loads it with indexing deferred, validates point count and
+atomically points the tenant's alias to it. Queries keep hitting the old
+collection until the swap.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from langchain_core.documents import Document
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from app.core.config import settings
+from app.core.tenancy import TENANTS_SUBDIR, resolve_tenant, uploads_dir
+from app.infrastructure.qdrant import qdrant_service
+from app.services.document_processor import (
+    SUPPORTED_EXTENSIONS,
+    load_document_cached,
+    parsed_cache,
+    split_documents,
+    upload_to_qdrant,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+class ReindexStats:
+    """Throughput counters for re-index run."""
+
+    def __init__(self) -> None:
+        """Start timer."""
+        self.started = time.perf_counter()
+        self.files = 0
+        self.pages = 0
+        self.chunks = 0
+        self.failed = 0
+
+    def add(self, pages: int, chunks: int) -> None:
+        """Record processed file."""
+        self.files += 1
+        self.pages += pages
+        self.chunks += chunks
+
+    def remove(self, result: tuple[int, int] | None) -> None:
+        """Forget earlier result (pages, chunks) of file, None for failure."""
+        if result is None:
+            self.failed -= 1
+            return
+        self.files -= 1
+        self.pages -= result[0]
+        self.chunks -= result[1]
+
+    def report(self, total_files: int) -> None:
+        """Log progress and throughput."""
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        logger.info(
+            "Progress: %d/%d files (%d failed), %d pages, %d chunks | "
+            "%.2f files/s, %.1f pages/s, %.1f chunks/s",
+            self.files, total_files, self.failed, self.pages, self.chunks,
+            self.files / elapsed, self.pages / elapsed, self.chunks / elapsed,
+        )
+
+
+def list_source_files(source_dir: str, tenant: str) -> dict[str, float]:
+    """Find tenant's supported files with their modification times."""
+    tenants_dir = os.path.abspath(os.path.join(settings.UPLOADS_DIR, TENANTS_SUBDIR))
+    files = {}
+    for root, dirs, names in os.walk(source_dir):
+        if os.path.abspath(root) == tenants_dir:
+            # Walking default tenant's root: skip other tenants' uploads
+            dirs[:] = [d for d in dirs if d == tenant]
+        for name in names:
+            if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                path = os.path.join(root, name)
+                files[path] = os.path.getmtime(path)
+    return files
+
+
+def get_client() -> QdrantClient:
+    """Create sync Qdrant client for worker processes."""
+    return QdrantClient(
+        host=settings.QDRANT_HOST,
+        port=settings.QDRANT_PORT,
+        grpc_port=settings.QDRANT_GRPC_PORT,
+        prefer_grpc=settings.QDRANT_PREFER_GRPC,
+    )
+
+
+def _source_filter(source: str) -> models.Filter:
+    """Match points uploaded from source."""
+    return models.Filter(must=[
+        models.FieldCondition(key="metadata.source", match=models.MatchValue(value=source)),
+    ])
+
+
+def _scroll(client: QdrantClient, collection_name: str, **kwargs) -> list[models.Record]:
+    """Read all matching points without vectors."""
+    points, offset = [], None
+    while True:
+        batch, offset = client.scroll(
+            collection_name=collection_name,
+            limit=settings.QDRANT_UPSERT_BATCH_SIZE,
+            offset=offset,
+            with_vectors=False,
+            **kwargs,
+        )
+        points.extend(batch)
+        if offset is None:
+            return points
+
+
+def list_streamed_documents(collection_name: str) -> dict[str, str]:
+    """Find streamed documents in collection with their content hashes."""
+    client = get_client()
+    try:
+        points = _scroll(
+            client,
+            collection_name,
+            scroll_filter=models.Filter(must_not=[
+                models.IsEmptyCondition(is_empty=models.PayloadField(key="metadata.file_hash")),
+            ]),
+            with_payload=["metadata.source", "metadata.file_hash"],
+        )
+    finally:
+        client.close()
+    return {p.payload["metadata"]["source"]: p.payload["metadata"]["file_hash"] for p in points}
+
+
+def load_stored_chunks(source: str, collection_name: str) -> list[Document]:
+    """Load chunks uploaded from source back from their payloads, in document order."""
+    client = get_client()
+    try:
+        points = _scroll(client, collection_name, scroll_filter=_source_filter(source), with_payload=True)
+    finally:
+        client.close()
+    chunks = [Document(page_content=p.payload["page_content"], metadata=p.payload["metadata"]) for p in points]
+    chunks.sort(key=lambda c: (c.metadata.get("page", 0), c.metadata.get("chunk_index", 0)))
+    return chunks
+
+
+def delete_file_points(file_path: str, collection_name: str) -> None:
+    """Delete all points uploaded from file."""
+    client = get_client()
+    try:
+        client.delete(
+            collection_name=collection_name,
+            points_selector=models.FilterSelector(filter=_source_filter(file_path)),
+            wait=True,
+        )
+    finally:
+        client.close()
+
+
+def reindex_file(file_path: str, collection_name: str, replace: bool = False) -> tuple[int, int]:
+    """Worker: parse, chunk, embed and upsert single file. Returns (pages, chunks).
+
+    With replace, points from file's earlier upload are deleted first.
+    """
+    if replace:
+        delete_file_points(file_path, collection_name)
+    documents = load_document_cached(file_path)
+    chunks = split_documents(documents)
+    if chunks:
+        upload_to_qdrant(chunks, collection_name=collection_name)
+    return len(documents), len(chunks)
+
+
+def reindex_streamed(source: str, file_hash: str, source_collection: str, collection_name: str) -> tuple[int, int]:
+    """Worker: rebuild streamed document that has no saved file. Returns (pages, chunks).
+
+    Pages come from parsed text cache; on miss, chunks stored in source
+    collection are re-embedded as they are, keeping their old chunking.
+    """
+    documents = parsed_cache.get(file_hash, source) if parsed_cache is not None else None
+    if documents is not None:
+        for document in documents:
+            document.metadata["file_hash"] = file_hash
+        chunks = split_documents(documents)
+        pages = len(documents)
+    else:
+        chunks = load_stored_chunks(source, source_collection)
+        pages = len({c.metadata.get("page", 0) for c in chunks})
+    if chunks:
+        upload_to_qdrant(chunks, collection_name=collection_name)
+    return pages, len(chunks)
+
+
+class CollectionBuilder:
+    """Load tenant's source files and streamed documents into collection with process pool.
+
+    Tracks what was loaded: file mtime, or content hash for streamed documents
+    found in source collection without a saved file.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        source_dir: str,
+        tenant: str,
+        workers: int,
+        source_collection: str | None = None,
+    ) -> None:
+        """Initialize builder for empty collection."""
+        self.collection_name = collection_name
+        self.source_dir = source_dir
+        self.tenant = tenant
+        self.workers = workers
+        self.source_collection = source_collection
+        self.stats = ReindexStats()
+        self.processed: dict[str, float | str] = {}
+        # (pages, chunks) uploaded per file, None if it failed
+        self.uploaded: dict[str, tuple[int, int] | None] = {}
+
+    def pending(self) -> dict[str, float | str]:
+        """Files new or modified since they were loaded, and streamed documents not loaded yet."""
+        current: dict[str, float | str] = {}
+        if self.source_collection is not None:
+            current.update(list_streamed_documents(self.source_collection))
+        # Saved copy of streamed upload is loaded as file
+        current.update(list_source_files(self.source_dir, self.tenant))
+        return {path: version for path, version in current.items() if self.processed.get(path) != version}
+
+    def sync(self) -> ReindexStats:
+        """Load pending files, repeating until no new or modified files appear."""
+        pending = self.pending()
+        if not pending:
+            return self.stats
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            while pending:
+                self._load(pool, pending)
+                pending = self.pending()
+        return self.stats
+
+    def _load(self, pool: ProcessPoolExecutor, pending: dict[str, float | str]) -> None:
+        """Load files in parallel and record results."""
+        logger.info("Indexing %d files with %d workers", len(pending), self.workers)
+        total = len(self.processed.keys() | pending.keys())
+        futures = {}
+        for path, version in pending.items():
+            if isinstance(version, str):
+                future = pool.submit(
+                    reindex_streamed, path, version, self.source_collection, self.collection_name
+                )
+            else:
+                future = pool.submit(reindex_file, path, self.collection_name, path in self.processed)
+            futures[future] = path
+        for future in as_completed(futures):
+            path = futures[future]
+            self.processed[path] = pending[path]
+            # Modified file was uploaded before: count only its latest version
+            if path in self.uploaded:
+                self.stats.remove(self.uploaded.pop(path))
+            try:
+                pages, chunks = future.result()
+                self.stats.add(pages, chunks)
+                self.uploaded[path] = (pages, chunks)
+            except Exception as e:
+                self.stats.failed += 1
+                self.uploaded[path] = None
+                logger.error("Failed to index %s: %s", path, e)
+            self.stats.report(total)
+
+
+async def reindex(
+    source_dir: str,
+    tenant: str,
+    workers: int,
+    drop_old: bool,
+    allow_failures: bool,
+) -> bool:
+    """Rebuild tenant's collection and switch alias. Returns True on success.
+
+    Files saved to source dir during the rebuild are picked up by rescans:
+    after bulk load, right before the swap and once more after it, since
+    ingestion worker may have indexed a file into the old collection only
+    between the last rescan and the swap. Chunk point IDs are deterministic,
+    so a file indexed both by the worker and the rescan is not duplicated.
+
+    Streamed documents without a saved file (INGEST_SAVE_UPLOADS off) are
+    found by their content hash in the current collection and rebuilt from
+    parsed text cache, or from their stored chunks when the cache misses.
+    """
+    alias = qdrant_service.collection_for(tenant)
+    previous = await qdrant_service.get_alias_target(tenant)
+    current = await qdrant_service.resolve_collection(tenant)
+    name = qdrant_service.versioned_name(tenant)
+    logger.info("Building collection %s (alias %s -> %s)", name, alias, previous)
+
+    await qdrant_service.create_collection(name, defer_indexing=True)
+
+    loop = asyncio.get_running_loop()
+    builder = CollectionBuilder(name, source_dir, tenant, workers, current)
+    stats = await loop.run_in_executor(None, builder.sync)
+    load_seconds = time.perf_counter() - stats.started
+
+    logger.info("Bulk load finished in %.1fs, building index...", load_seconds)
+    index_start = time.perf_counter()
+    await qdrant_service.enable_indexing(name)
+    logger.info("Index built in %.1fs", time.perf_counter() - index_start)
+
+    # Uploads that arrived while index was built
+    await loop.run_in_executor(None, builder.sync)
+
+    points = await qdrant_service.count(name)
+    if points != stats.chunks:
+        logger.error("Validation failed: %d points in %s, expected %d", points, name, stats.chunks)
+        return False
+    if stats.failed and not allow_failures:
+        logger.error("Validation failed: %d files could not be indexed", stats.failed)
+        return False
+
+    await qdrant_service.swap_alias(name, tenant)
+    logger.info("Alias %s now points to %s (%d points)", alias, name, points)
+
+    # Uploads saved between last rescan and swap may be only in previous collection
+    await loop.run_in_executor(None, builder.sync)
+
+    if drop_old and previous:
+        await qdrant_service.drop_collection(previous)
+        logger.info("Dropped previous collection %s", previous)
+
+    stats.report(stats.files)
+    return True
+
+
+def main() -> None:
+    """Re-index entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tenant", default="", help="tenant to re-index (default tenant if empty)")
+    parser.add_argument("--source-dir", help="defaults to tenant's upload directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--drop-old", action="store_true", help="delete previous collection after swap")
+    parser.add_argument("--allow-failures", action="store_true", help="swap alias even if some files failed")
+    args = parser.parse_args()
+
+    tenant = resolve_tenant(args.tenant)
+    source_dir = args.source_dir or uploads_dir(tenant)
+    ok = asyncio.run(reindex(source_dir, tenant, args.workers, args.drop_old, args.allow_failures))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 """Services package."""
-from app.services.document_processor import process_document
+from app.services.document_processor import process_document, process_stream
 from app.services.embeddings import embeddings_service
 from app.services.llm import llm_service
 from app.services.rag import RAGResponse, Source, process_query
@@ -9,6 +9,7 @@ __all__ = [
     "llm_service",
     "process_document",
     "process_query",
+    "process_stream",
     "RAGResponse",
     "Source",
 ]
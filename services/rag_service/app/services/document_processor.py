@@ -1,9 +1,14 @@
 """Document processing with tiktoken-based chunking."""
 import asyncio
+import hashlib
 import logging
 import os
+import shutil
+import uuid
+from typing import BinaryIO, Callable
 
 import docx
+import pypdf
 import tiktoken
 from langchain_community.document_loaders import PyPDFLoader, TextLoader
 from langchain_community.vectorstores import Qdrant
@@ -11,7 +16,9 @@ from langchain_core.documents import Document
 from qdrant_client import QdrantClient
 
 from app.core.config import settings
-from app.core.metrics import DOCUMENT_PROCESSED
+from app.core.metrics import DOCUMENT_PROCESSED, TENANT_CHUNKS_INDEXED, TENANT_DOCUMENTS
+from app.core.tenancy import uploads_dir
+from app.infrastructure.parsed_cache import ParsedTextCache
 from app.infrastructure.qdrant import qdrant_service
 from app.services.embeddings import embeddings_service
 
@@ -19,6 +26,9 @@ logger = logging.getLogger(__name__)
 
 SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
 
+# Bump when loader output changes so cached parses are not reused
+LOADER_VERSION = 3
+
 
 class TokenTextSplitter:
     """Split text by token count using tiktoken."""
@@ -78,6 +88,43 @@ text_splitter = TokenTextSplitter(
 )
 
 
+parsed_cache = (
+    ParsedTextCache(settings.PARSED_CACHE_DIR, LOADER_VERSION)
+    if settings.PARSED_CACHE_ENABLED
+    else None
+)
+
+
+def load_docx(file: str | BinaryIO, source: str | None = None) -> list[Document]:
+    """Load DOCX from path or stream split into pages at page and section breaks."""
+    source = file if source is None else source
+    doc = docx.Document(file)
+    pages: list[list[str]] = [[]]
+
+    for paragraph in doc.paragraphs:
+        p = paragraph._p
+        page_break = p.xpath('.//w:br[@w:type="page"]') or p.xpath(".//w:lastRenderedPageBreak")
+        if page_break and pages[-1]:
+            pages.append([])
+
+        pages[-1].append(paragraph.text)
+
+        # Section properties inside paragraph mark the end of a section
+        if p.pPr is not None and p.pPr.sectPr is not None:
+            pages.append([])
+
+    documents = []
+    for lines in pages:
+        text = "\n".join(lines)
+        if not text.strip():
+            continue
+        documents.append(Document(
+            page_content=text,
+            metadata={"source": source, "page": len(documents)},
+        ))
+    return documents
+
+
 def load_document(file_path: str) -> list[Document]:
     """Load document by file extension."""
     ext = os.path.splitext(file_path)[1].lower()
@@ -86,22 +133,78 @@ def load_document(file_path: str) -> list[Document]:
         return PyPDFLoader(file_path).load()
 
     if ext == ".docx":
-        doc = docx.Document(file_path)
-        text = "\n".join([p.text for p in doc.paragraphs])
-        return [Document(page_content=text, metadata={"source": file_path})]
+        return load_docx(file_path)
 
     if ext == ".txt":
-        return TextLoader(file_path, encoding="utf-8").load()
+        documents = TextLoader(file_path, encoding="utf-8").load()
+        for document in documents:
+            document.metadata["page"] = 0
+        return documents
 
     raise ValueError(f"Unsupported format: {ext}")
 
 
+def load_stream(stream: BinaryIO, source: str) -> list[Document]:
+    """Load document from binary stream; source name selects format and is stored in metadata."""
+    ext = os.path.splitext(source)[1].lower()
+
+    if ext == ".pdf":
+        reader = pypdf.PdfReader(stream)
+        return [
+            Document(page_content=page.extract_text(), metadata={"source": source, "page": i})
+            for i, page in enumerate(reader.pages)
+        ]
+
+    if ext == ".docx":
+        return load_docx(stream, source)
+
+    if ext == ".txt":
+        return [Document(page_content=stream.read().decode("utf-8"), metadata={"source": source, "page": 0})]
+
+    raise ValueError(f"Unsupported format: {ext}")
+
+
+def _load_cached(file_hash: str, source: str, load: Callable[[], list[Document]]) -> list[Document]:
+    """Load document from parsed text cache, parsing and caching on miss."""
+    documents = parsed_cache.get(file_hash, source)
+    if documents is None:
+        documents = load()
+        parsed_cache.put(file_hash, documents)
+    return documents
+
+
+def load_document_cached(file_path: str) -> list[Document]:
+    """Load document from parsed text cache, parsing and caching on miss."""
+    if parsed_cache is None:
+        return load_document(file_path)
+
+    with open(file_path, "rb") as f:
+        file_hash = hashlib.file_digest(f, "sha256").hexdigest()
+    return _load_cached(file_hash, file_path, lambda: load_document(file_path))
+
+
+def load_stream_cached(stream: BinaryIO, source: str, file_hash: str) -> list[Document]:
+    """Load document from stream via parsed text cache."""
+    if parsed_cache is None:
+        return load_stream(stream, source)
+    return _load_cached(file_hash, source, lambda: load_stream(stream, source))
+
+
 def split_documents(documents: list[Document]) -> list[Document]:
     """Split documents into token-sized chunks."""
     return text_splitter.split_documents(documents)
 
 
-def upload_to_qdrant(chunks: list[Document]) -> None:
+def chunk_id(chunk: Document) -> str:
+    """Deterministic point ID, so uploading same file again overwrites its points."""
+    meta = chunk.metadata
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{meta.get('source')}#{meta.get('page', 0)}#{meta.get('chunk_index')}"))
+
+
+def upload_to_qdrant(
+    chunks: list[Document],
+    collection_name: str = settings.QDRANT_COLLECTION,
+) -> None:
     """Upload document chunks to Qdrant via gRPC."""
     logger.info(f"Uploading {len(chunks)} chunks to Qdrant (gRPC)...")
     
@@ -116,36 +219,92 @@ def upload_to_qdrant(chunks: list[Document]) -> None:
     # Use Qdrant VectorStore with explicit client
     vector_store = Qdrant(
         client=client,
-        embeddings=embeddings_service.model,
-        collection_name=settings.QDRANT_COLLECTION,
+        embeddings=embeddings_service.document_model,
+        collection_name=collection_name,
+    )
+    vector_store.add_documents(
+        chunks,
+        ids=[chunk_id(c) for c in chunks],
+        batch_size=settings.QDRANT_UPSERT_BATCH_SIZE,
     )
-    vector_store.add_documents(chunks)
 
 
-async def process_document(file_path: str) -> None:
-    """Process document: load, split by tokens, embed, and store."""
-    if not os.path.exists(file_path):
-        DOCUMENT_PROCESSED.labels(status="not_found").inc()
-        raise FileNotFoundError(f"File not found: {file_path}")
-
-    ext = os.path.splitext(file_path)[1].lower()
-    if ext not in SUPPORTED_EXTENSIONS:
-        DOCUMENT_PROCESSED.labels(status="unsupported").inc()
-        raise ValueError(f"Unsupported format: {ext}")
-
+async def _ingest(load: Callable[[], list[Document]], tenant: str) -> tuple[int, int]:
+    """Load, split and store document in tenant's collection. Returns (pages, chunks)."""
     loop = asyncio.get_running_loop()
+    await qdrant_service.tenant_ready(tenant, create=True)
+    collection_name = qdrant_service.collection_for(tenant)
 
-    def process() -> None:
-        documents = load_document(file_path)
+    def process() -> tuple[int, int]:
+        documents = load()
         chunks = split_documents(documents)
         logger.info(f"Split into {len(chunks)} token-based chunks")
-        upload_to_qdrant(chunks)
+        upload_to_qdrant(chunks, collection_name=collection_name)
+        return len(documents), len(chunks)
 
     try:
-        await loop.run_in_executor(None, process)
+        pages, chunk_count = await loop.run_in_executor(None, process)
         DOCUMENT_PROCESSED.labels(status="success").inc()
-        logger.info(f"Document processed: {file_path}")
+        TENANT_DOCUMENTS.labels(tenant=tenant, status="success").inc()
+        TENANT_CHUNKS_INDEXED.labels(tenant=tenant).inc(chunk_count)
     except Exception as e:
         DOCUMENT_PROCESSED.labels(status="error").inc()
+        TENANT_DOCUMENTS.labels(tenant=tenant, status="error").inc()
         logger.error(f"Document processing failed: {e}")
         raise
+    return pages, chunk_count
+
+
+def _check_format(path: str, tenant: str) -> None:
+    """Raise ValueError for unsupported file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        DOCUMENT_PROCESSED.labels(status="unsupported").inc()
+        TENANT_DOCUMENTS.labels(tenant=tenant, status="unsupported").inc()
+        raise ValueError(f"Unsupported format: {ext}")
+
+
+async def process_document(file_path: str, tenant: str = settings.DEFAULT_TENANT) -> None:
+    """Process document: load, split by tokens, embed, and store in tenant's collection."""
+    if not os.path.exists(file_path):
+        DOCUMENT_PROCESSED.labels(status="not_found").inc()
+        TENANT_DOCUMENTS.labels(tenant=tenant, status="not_found").inc()
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    _check_format(file_path, tenant)
+    await _ingest(lambda: load_document_cached(file_path), tenant)
+    logger.info(f"Document processed: {file_path}")
+
+
+async def process_stream(
+    stream: BinaryIO,
+    filename: str,
+    file_hash: str,
+    tenant: str = settings.DEFAULT_TENANT,
+) -> tuple[str, int, int]:
+    """Process uploaded document from (spooled) stream. Returns (source, pages, chunks).
+
+    Source is the path the file would have in tenant's uploads dir, named by
+    content hash and filename, so uploading the same file again overwrites its
+    points instead of duplicating them. With INGEST_SAVE_UPLOADS the file is
+    also written there.
+    """
+    source = os.path.join(uploads_dir(tenant), f"{file_hash}_{os.path.basename(filename)}")
+    _check_format(source, tenant)
+
+    def load() -> list[Document]:
+        stream.seek(0)
+        documents = load_stream_cached(stream, source, file_hash)
+        for document in documents:
+            document.metadata["file_hash"] = file_hash
+        # Saved only once parsed, so re-index never trips over a broken upload
+        if settings.INGEST_SAVE_UPLOADS:
+            os.makedirs(os.path.dirname(source), exist_ok=True)
+            stream.seek(0)
+            with open(source, "wb") as f:
+                shutil.copyfileobj(stream, f)
+        return documents
+
+    pages, chunk_count = await _ingest(load, tenant)
+    logger.info(f"Streamed document processed: {source}")
+    return source, pages, chunk_count
@@ -1,9 +1,42 @@
 """Embeddings service using HuggingFace."""
+from __future__ import annotations
+
 import asyncio
 
+from langchain_core.embeddings import Embeddings
 from langchain_huggingface import HuggingFaceEmbeddings
 
 from app.core.config import settings
+from app.infrastructure.embedding_store import EmbeddingStore
+
+
+class StoreBackedEmbeddings(Embeddings):
+    """Document embeddings that reuse stored vectors and embed only misses."""
+
+    def __init__(self, model: Embeddings, store: EmbeddingStore, batch_size: int) -> None:
+        """Wrap model with embedding store."""
+        self.model = model
+        self.store = store
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Get vectors from store, embedding missing texts in batches."""
+        vectors = self.store.get_many(texts)
+        misses = [i for i, v in enumerate(vectors) if v is None]
+
+        for start in range(0, len(misses), self.batch_size):
+            batch = misses[start:start + self.batch_size]
+            batch_texts = [texts[i] for i in batch]
+            embedded = self.model.embed_documents(batch_texts)
+            self.store.put_many(batch_texts, embedded)
+            for i, vector in zip(batch, embedded):
+                vectors[i] = vector
+
+        return [v.tolist() if hasattr(v, "tolist") else list(v) for v in vectors]
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed query text directly (queries are not stored)."""
+        return self.model.embed_query(text)
 
 
 class EmbeddingsService:
@@ -12,11 +45,24 @@ class EmbeddingsService:
     def __init__(self) -> None:
         """Initialize embeddings model."""
         self.model = HuggingFaceEmbeddings(model_name=settings.EMBEDDINGS_MODEL)
+        self.document_model: Embeddings = self.model
+        if settings.EMBEDDING_STORE_ENABLED:
+            store = EmbeddingStore(
+                settings.EMBEDDING_STORE_DIR,
+                settings.EMBEDDINGS_MODEL,
+                settings.EMBEDDING_STORE_MAX_BYTES,
+            )
+            self.document_model = StoreBackedEmbeddings(
+                self.model, store, settings.EMBEDDING_BATCH_SIZE
+            )
 
-    async def embed_query(self, text: str) -> list[float]:
+    async def embed_query(self, text: str, timeout: float | None = None) -> list[float]:
         """Get embedding vector for query text."""
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self.model.embed_query, text)
+        return await asyncio.wait_for(
+            loop.run_in_executor(None, self.model.embed_query, text),
+            timeout,
+        )
 
     def embed_query_sync(self, text: str) -> list[float]:
         """Synchronous version for use in executors."""
@@ -0,0 +1,137 @@
+"""Rolling conversation summaries bounding history tokens sent to LLM."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+import tiktoken
+from jinja2 import Environment, FileSystemLoader
+from langchain_core.messages import HumanMessage
+
+from app.core.config import settings
+from app.core.metrics import (
+    HISTORY_PROMPT_TOKENS,
+    HISTORY_SUMMARY_LATENCY,
+    HISTORY_SUMMARY_UPDATES,
+    HISTORY_TOKENS_SAVED,
+)
+from app.crud import get_messages, get_session, update_summary
+from app.models.chat import ChatSession, Message
+from app.services.llm import llm_service
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+jinja_env = Environment(loader=FileSystemLoader(TEMPLATES_DIR), autoescape=False)
+
+
+@dataclass
+class History:
+    """History to send with query."""
+
+    summary: str | None
+    turns: list[tuple[str, str]]
+    # Tokens of turns not yet covered by summary
+    tokens: int
+
+
+class HistorySummarizer:
+    """Fold older turns of long sessions into rolling summary in background."""
+
+    def __init__(
+        self,
+        enabled: bool = settings.HISTORY_SUMMARY_ENABLED,
+        trigger_tokens: int = settings.HISTORY_SUMMARY_TRIGGER_TOKENS,
+        keep_messages: int = settings.HISTORY_SUMMARY_KEEP_MESSAGES,
+    ) -> None:
+        """Initialize summarizer."""
+        self.enabled = enabled
+        self.trigger_tokens = trigger_tokens
+        self.keep_messages = keep_messages
+        self.encoding = tiktoken.get_encoding(settings.TIKTOKEN_ENCODING)
+        self._running: set[uuid.UUID] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens in text."""
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def compact(self, session: ChatSession, messages: list[Message]) -> History:
+        """Replace messages covered by session's summary with the summary."""
+        until = session.summarized_until
+        if not self.enabled or session.summary is None or until is None:
+            recent, folded, summary = messages, [], None
+        else:
+            recent = [m for m in messages if m.created_at > until]
+            folded = [m for m in messages if m.created_at <= until]
+            summary = session.summary
+
+        tokens = sum(self.count_tokens(m.content) for m in recent)
+        summary_tokens = self.count_tokens(summary) if summary else 0
+        HISTORY_PROMPT_TOKENS.observe(tokens + summary_tokens)
+        saved = sum(self.count_tokens(m.content) for m in folded) - summary_tokens
+        if saved > 0:
+            HISTORY_TOKENS_SAVED.inc(saved)
+
+        return History(summary, [(m.role, m.content) for m in recent], tokens)
+
+    def schedule(self, session_id: uuid.UUID, pending_tokens: int) -> None:
+        """Start background summary update once unsummarized history exceeds trigger."""
+        if not self.enabled or pending_tokens <= self.trigger_tokens or session_id in self._running:
+            return
+        self._running.add(session_id)
+        task = asyncio.create_task(self._run(session_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, session_id: uuid.UUID) -> None:
+        """Update summary, logging instead of raising."""
+        start = time.perf_counter()
+        try:
+            outcome = await self.update(session_id)
+        except Exception as e:
+            outcome = "error"
+            logger.warning("Summary update for session %s failed: %r", session_id, e)
+        finally:
+            self._running.discard(session_id)
+        HISTORY_SUMMARY_UPDATES.labels(outcome=outcome).inc()
+        HISTORY_SUMMARY_LATENCY.observe(time.perf_counter() - start)
+
+    async def update(self, session_id: uuid.UUID) -> str:
+        """Fold all but newest unsummarized messages into session summary. Returns outcome."""
+        session = await get_session(str(session_id))
+        if session is None:
+            return "skipped"
+        messages = await get_messages(
+            session_id, limit=settings.HISTORY_SUMMARY_MAX_MESSAGES, after=session.summarized_until
+        )
+        if (
+            len(messages) <= self.keep_messages
+            or sum(self.count_tokens(m.content) for m in messages) <= self.trigger_tokens
+        ):
+            return "skipped"
+
+        fold = messages[:-self.keep_messages] if self.keep_messages else messages
+        prompt = jinja_env.get_template("history_summary.j2").render(
+            previous=session.summary,
+            messages=[(m.role, m.content) for m in fold],
+            max_words=settings.HISTORY_SUMMARY_MAX_WORDS,
+        )
+        summary = await llm_service.generate_background(
+            [HumanMessage(content=prompt)], timeout=settings.HISTORY_SUMMARY_TIMEOUT_SECONDS
+        )
+
+        stored = await update_summary(
+            session_id, summary.strip(), fold[-1].created_at, session.summarized_until
+        )
+        if not stored:
+            return "conflict"
+        logger.info("Summarized %d messages of session %s", len(fold), session_id)
+        return "updated"
+
+
+history_summarizer = HistorySummarizer()
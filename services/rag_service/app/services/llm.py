@@ -1,24 +1,144 @@
 """LLM service using OpenAI."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from app.core.config import settings
+from app.core.deadline import Deadline
+from app.core.metrics import LLM_ATTEMPT_LATENCY, LLM_ENDPOINT_SKIPPED
+from app.services.llm_policy import HALF_OPEN, LLMEndpoint, LLMUnavailableError
+
+logger = logging.getLogger(__name__)
 
 
 class LLMService:
     """Service for LLM interactions."""
 
     def __init__(self) -> None:
-        """Initialize LLM client."""
-        self.llm = ChatOpenAI(
-            temperature=0,
-            model=settings.LLM_MODEL,
-            api_key=settings.OPENAI_API_KEY,
-        )
-
-    async def generate(self, messages: list[BaseMessage]) -> str:
-        """Generate response from messages."""
-        response = await self.llm.ainvoke(messages)
+        """Initialize LLM endpoints in fallback order."""
+        self.endpoints = [LLMEndpoint(model, base_url) for model, base_url in settings.llm_endpoints]
+        self.llm = self.endpoints[0].llm
+
+    async def generate(self, messages: list[BaseMessage], timeout: float | None = None) -> str:
+        """Generate response, failing over to next endpoint on error or timeout."""
+        deadline = Deadline(timeout)
+        last_error: Exception | None = None
+
+        for endpoint in self.endpoints:
+            deadline.remaining()
+            if not endpoint.breaker.allow():
+                LLM_ENDPOINT_SKIPPED.labels(endpoint=endpoint.name).inc()
+                continue
+            probe = endpoint.breaker.state == HALF_OPEN
+
+            try:
+                return await self._hedged_call(endpoint, messages, deadline)
+            except Exception as e:
+                last_error = e
+                logger.warning("LLM endpoint %s failed: %r", endpoint.name, e)
+            finally:
+                # Probe that recorded no outcome must not block the circuit forever
+                if probe and endpoint.breaker.state == HALF_OPEN:
+                    endpoint.breaker.release_probe()
+
+        deadline.remaining()
+        raise LLMUnavailableError("All LLM endpoints unavailable") from last_error
+
+    async def generate_background(self, messages: list[BaseMessage], timeout: float | None = None) -> str:
+        """Generate for background work: endpoints in order, without hedging.
+
+        Attempts bypass circuit breakers and latency windows, so slow or failing
+        background calls do not steer the policy of user-facing requests.
+        """
+        deadline = Deadline(timeout)
+        last_error: Exception | None = None
+
+        for endpoint in self.endpoints:
+            try:
+                return await self._attempt(endpoint, messages, deadline, "background", track=False)
+            except Exception as e:
+                last_error = e
+                logger.warning("LLM endpoint %s failed background call: %r", endpoint.name, e)
+
+        raise LLMUnavailableError("All LLM endpoints unavailable") from last_error
+
+    async def _hedged_call(
+        self,
+        endpoint: LLMEndpoint,
+        messages: list[BaseMessage],
+        deadline: Deadline,
+    ) -> str:
+        """Call endpoint; send a second request if the first is slower than usual."""
+        pending = {asyncio.ensure_future(self._attempt(endpoint, messages, deadline, "primary"))}
+        error: BaseException | None = None
+
+        try:
+            if settings.LLM_HEDGE_ENABLED:
+                done, pending = await asyncio.wait(pending, timeout=endpoint.hedge_delay())
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if pending and endpoint.breaker.allow():
+                    pending.add(asyncio.ensure_future(
+                        self._attempt(endpoint, messages, deadline, "hedge")
+                    ))
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _attempt(
+        self,
+        endpoint: LLMEndpoint,
+        messages: list[BaseMessage],
+        deadline: Deadline,
+        kind: str,
+        track: bool = True,
+    ) -> str:
+        """Single request to endpoint with per-attempt timeout.
+
+        Without track, outcome is not recorded in endpoint's breaker and latency window.
+        """
+        start = time.perf_counter()
+        outcome = "error"
+        timeout = deadline.remaining(settings.LLM_ATTEMPT_TIMEOUT_SECONDS)
+        try:
+            response = await asyncio.wait_for(endpoint.llm.ainvoke(messages), timeout)
+            outcome = "success"
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            # Caller's short deadline is not the endpoint's fault
+            if track and (timeout is None or timeout >= settings.LLM_ATTEMPT_TIMEOUT_SECONDS):
+                endpoint.breaker.record_failure()
+            raise
+        except Exception:
+            if track:
+                endpoint.breaker.record_failure()
+            raise
+        finally:
+            LLM_ATTEMPT_LATENCY.labels(
+                endpoint=endpoint.name, kind=kind, outcome=outcome
+            ).observe(time.perf_counter() - start)
+
+        if track:
+            endpoint.breaker.record_success()
+            endpoint.latency.add(time.perf_counter() - start)
         return str(response.content)
 
     def build_messages(
@@ -26,9 +146,12 @@ class LLMService:
         system_prompt: str,
         history: list[tuple[str, str]],
         query: str,
+        summary: str | None = None,
     ) -> list[BaseMessage]:
-        """Build message list for LLM."""
+        """Build message list for LLM; summary stands in for turns older than history."""
         messages: list[BaseMessage] = [SystemMessage(content=system_prompt)]
+        if summary:
+            messages.append(SystemMessage(content=f"Summary of earlier conversation:\n{summary}"))
 
         for role, content in history:
             if role == "user":
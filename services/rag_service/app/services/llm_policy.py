@@ -0,0 +1,119 @@
+"""Timeout, hedging and circuit breaking policy for LLM endpoints."""
+from __future__ import annotations
+
+import time
+from collections import deque
+
+from langchain_openai import ChatOpenAI
+
+from app.core.config import settings
+from app.core.metrics import LLM_CIRCUIT_STATE
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class LLMUnavailableError(Exception):
+    """Raised when no LLM endpoint could produce an answer."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = settings.LLM_CIRCUIT_RESET_SECONDS,
+    ) -> None:
+        """Initialize breaker in closed state."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self._set_state(CLOSED)
+
+    def allow(self) -> bool:
+        """Check if request may be sent. Open circuit lets a single probe through after reset timeout."""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self.probe_in_flight:
+                return False
+            self.probe_in_flight = True
+        return True
+
+    def release_probe(self) -> None:
+        """Free probe slot when probe ended without outcome (cancelled or caller's deadline)."""
+        self.probe_in_flight = False
+
+    def record_success(self) -> None:
+        """Close circuit after successful call."""
+        self.failures = 0
+        self.probe_in_flight = False
+        if self.state != CLOSED:
+            self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        """Count failure and open circuit when threshold is reached."""
+        self.failures += 1
+        self.probe_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    def _set_state(self, state: str) -> None:
+        """Update state and export it."""
+        self.state = state
+        LLM_CIRCUIT_STATE.labels(endpoint=self.name).set(_STATE_VALUES[state])
+
+
+class LatencyWindow:
+    """Sliding window of recent successful latencies."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20) -> None:
+        """Initialize empty window."""
+        self.samples: deque[float] = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def add(self, latency: float) -> None:
+        """Record latency in seconds."""
+        self.samples.append(latency)
+
+    def quantile(self, q: float) -> float | None:
+        """Get latency quantile, or None until enough samples are collected."""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class LLMEndpoint:
+    """Single OpenAI-compatible model endpoint with its own breaker and latency stats."""
+
+    def __init__(self, model: str, base_url: str = "") -> None:
+        """Initialize chat client without built-in retries (policy handles them)."""
+        self.model = model
+        self.base_url = base_url
+        self.name = f"{model}@{base_url}" if base_url else model
+        self.llm = ChatOpenAI(
+            temperature=0,
+            model=model,
+            api_key=settings.OPENAI_API_KEY,
+            base_url=base_url or None,
+            max_retries=0,
+        )
+        self.breaker = CircuitBreaker(self.name)
+        self.latency = LatencyWindow()
+
+    def hedge_delay(self) -> float:
+        """Delay before sending hedged request: observed p95 or configured default."""
+        observed = self.latency.quantile(settings.LLM_HEDGE_QUANTILE)
+        return observed if observed is not None else settings.LLM_HEDGE_DELAY_SECONDS
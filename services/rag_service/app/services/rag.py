@@ -1,4 +1,5 @@
 """RAG pipeline service with Jinja2 templates."""
+import asyncio
 import logging
 import os
 import time
@@ -7,11 +8,25 @@ from pathlib import Path
 
 from jinja2 import Environment, FileSystemLoader
 
-from app.core.metrics import LLM_LATENCY, REQUEST_COUNT, REQUEST_LATENCY, VECTOR_SEARCH_LATENCY
+from app.core.config import settings
+from app.core.deadline import Deadline
+from app.core.metrics import (
+    LLM_LATENCY,
+    REQUEST_COUNT,
+    REQUEST_LATENCY,
+    TENANT_REQUEST_LATENCY,
+    TENANT_REQUESTS,
+    TENANT_SEARCH_LATENCY,
+    VECTOR_SEARCH_LATENCY,
+)
+from app.core.singleflight import SingleFlight
 from app.crud import get_messages, get_or_create_session, save_message
 from app.infrastructure.qdrant import qdrant_service
 from app.services.embeddings import embeddings_service
+from app.services.history import History, history_summarizer
 from app.services.llm import llm_service
+from app.services.retrieval import diversify, expand_passages, neighbor_ranges
+from app.services.retrieval_policy import GENERATE, NO_RESULTS, answer_policy
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +34,11 @@ logger = logging.getLogger(__name__)
 TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
 jinja_env = Environment(loader=FileSystemLoader(TEMPLATES_DIR), autoescape=False)
 
+NO_ANSWER = "No relevant information found in documents."
+
+retrieval_flight = SingleFlight("retrieval", enabled=settings.SINGLEFLIGHT_ENABLED)
+generation_flight = SingleFlight("generation", enabled=settings.SINGLEFLIGHT_ENABLED)
+
 
 @dataclass
 class Source:
@@ -44,27 +64,127 @@ def render_system_prompt(context: str) -> str:
     return template.render(context=context)
 
 
-async def process_query(query: str, session_id: str | None = None) -> RAGResponse:
-    """Process user query through RAG pipeline."""
+def normalize_query(query: str) -> str:
+    """Normalize query for coalescing: case-fold and collapse whitespace."""
+    return " ".join(query.lower().split())
+
+
+async def retrieve(query: str, limit: int, deadline: Deadline, tenant: str) -> list[dict]:
+    """Embed query, search tenant's collection and diversify hits, shared between identical concurrent queries.
+
+    Shared execution runs under per-stage timeouts rather than any caller's
+    deadline, which each caller enforces only on its own wait.
+    """
+    async def run() -> list[dict]:
+        if not await qdrant_service.tenant_ready(tenant):
+            return []
+        query_vector = await embeddings_service.embed_query(
+            query, timeout=settings.EMBEDDING_TIMEOUT_SECONDS
+        )
+        hits = await qdrant_service.search(
+            query_vector,
+            limit=max(settings.RETRIEVAL_CANDIDATES, limit),
+            timeout=settings.QDRANT_TIMEOUT_SECONDS,
+            with_vectors=settings.MMR_ENABLED,
+            tenant=tenant,
+        )
+        if settings.RETRIEVAL_ADAPTIVE_ENABLED:
+            passages = diversify(
+                hits,
+                limit,
+                settings.MMR_LAMBDA,
+                use_mmr=settings.MMR_ENABLED,
+                floor=settings.RETRIEVAL_SCORE_FLOOR,
+                max_gap=settings.RETRIEVAL_MAX_GAP,
+                min_k=settings.RETRIEVAL_MIN_K,
+                overlap=settings.CHUNK_OVERLAP_TOKENS,
+                max_tokens=settings.RETRIEVAL_CONTEXT_TOKENS,
+            )
+        else:
+            passages = diversify(
+                hits,
+                limit,
+                settings.MMR_LAMBDA,
+                use_mmr=settings.MMR_ENABLED,
+                overlap=settings.CHUNK_OVERLAP_TOKENS,
+                max_tokens=settings.RETRIEVAL_CONTEXT_TOKENS,
+            )
+        if settings.RETRIEVAL_MODE != "small_to_big" or not passages:
+            return passages
+
+        neighbors = await qdrant_service.fetch_chunks(
+            neighbor_ranges(passages, settings.RETRIEVAL_EXPAND_CHUNKS),
+            timeout=settings.QDRANT_TIMEOUT_SECONDS,
+            tenant=tenant,
+        )
+        return expand_passages(
+            passages, neighbors, settings.RETRIEVAL_CONTEXT_TOKENS, settings.CHUNK_OVERLAP_TOKENS
+        )
+
+    key = (tenant, normalize_query(query), limit)
+    return await retrieval_flight.do(key, run, timeout=deadline.remaining())
+
+
+async def generate(
+    query: str,
+    history: History,
+    system_prompt: str,
+    deadline: Deadline,
+    tenant: str,
+) -> str:
+    """Call LLM, shared between identical concurrent queries of tenant with the same history.
+
+    Like retrieve, runs under LLM_TIMEOUT_SECONDS and caller's deadline bounds only its wait.
+    """
+    async def run() -> str:
+        messages = llm_service.build_messages(system_prompt, history.turns, query, history.summary)
+        return await llm_service.generate(
+            messages, timeout=settings.LLM_TIMEOUT_SECONDS
+        )
+
+    key = (tenant, normalize_query(query), system_prompt, history.summary, tuple(history.turns))
+    return await generation_flight.do(key, run, timeout=deadline.remaining())
+
+
+async def process_query(
+    query: str,
+    session_id: str | None = None,
+    timeout: float | None = None,
+    tenant: str = settings.DEFAULT_TENANT,
+) -> RAGResponse:
+    """Process user query of tenant through RAG pipeline within optional timeout (seconds)."""
     start_time = time.perf_counter()
+    deadline = Deadline(timeout)
+    status = "error"
 
     try:
-        sid, _ = await get_or_create_session(session_id)
+        session, _ = await get_or_create_session(session_id, tenant)
+        sid = session.id
         await save_message(sid, "user", query)
 
         history_msgs = await get_messages(sid, limit=10)
-        history = [(m.role, m.content) for m in history_msgs[:-1]]
+        history = history_summarizer.compact(session, history_msgs[:-1])
+        pending_tokens = history.tokens + history_summarizer.count_tokens(query)
 
         vector_start = time.perf_counter()
-        query_vector = await embeddings_service.embed_query(query)
-        search_results = await qdrant_service.search(query_vector, limit=3)
-        VECTOR_SEARCH_LATENCY.observe(time.perf_counter() - vector_start)
-
-        if not search_results:
-            answer = "No relevant information found in documents."
+        limit = settings.RETRIEVAL_MAX_K if settings.RETRIEVAL_ADAPTIVE_ENABLED else settings.RETRIEVAL_TOP_K
+        search_results = await retrieve(query, limit, deadline, tenant)
+        vector_seconds = time.perf_counter() - vector_start
+        VECTOR_SEARCH_LATENCY.observe(vector_seconds)
+        TENANT_SEARCH_LATENCY.labels(tenant=tenant).observe(vector_seconds)
+
+        decision = answer_policy.decide(search_results)
+        if decision != GENERATE:
+            answer = NO_ANSWER
             await save_message(sid, "assistant", answer)
-            REQUEST_COUNT.labels(method="chat", status="no_results").inc()
-            logger.info(f"No results for query: {query[:50]}...")
+            history_summarizer.schedule(sid, pending_tokens)
+            status = decision
+            REQUEST_COUNT.labels(method="chat", status=status).inc()
+            if decision == NO_RESULTS:
+                logger.info(f"No results for query: {query[:50]}...")
+            else:
+                top = max(r["score"] for r in search_results)
+                logger.info(f"Low confidence ({top:.2f}), skipping LLM for query: {query[:50]}...")
             return RAGResponse(answer=answer, sources=[], session_id=str(sid))
 
         context_parts = []
@@ -80,22 +200,38 @@ async def process_query(query: str, session_id: str | None = None) -> RAGRespons
         context = "\n---\n".join(context_parts)
         system_prompt = render_system_prompt(context)
 
-        messages = llm_service.build_messages(system_prompt, history, query)
-
         llm_start = time.perf_counter()
-        answer = await llm_service.generate(messages)
-        LLM_LATENCY.observe(time.perf_counter() - llm_start)
+        answer = await generate(query, history, system_prompt, deadline, tenant)
+        llm_seconds = time.perf_counter() - llm_start
+        LLM_LATENCY.observe(llm_seconds)
+        answer_policy.record_llm_latency(llm_seconds)
 
         await save_message(sid, "assistant", answer)
+        history_summarizer.schedule(sid, pending_tokens + history_summarizer.count_tokens(answer))
 
-        REQUEST_COUNT.labels(method="chat", status="success").inc()
+        status = "success"
+        REQUEST_COUNT.labels(method="chat", status=status).inc()
         logger.info(f"Query processed in {time.perf_counter() - start_time:.2f}s")
         return RAGResponse(answer=answer, sources=sources, session_id=str(sid))
 
+    except asyncio.TimeoutError:
+        status = "timeout"
+        REQUEST_COUNT.labels(method="chat", status=status).inc()
+        logger.warning(f"RAG pipeline timed out for query: {query[:50]}...")
+        raise
+
+    except asyncio.CancelledError:
+        status = "cancelled"
+        REQUEST_COUNT.labels(method="chat", status=status).inc()
+        raise
+
     except Exception as e:
         REQUEST_COUNT.labels(method="chat", status="error").inc()
         logger.error(f"RAG pipeline error: {e}")
         raise
 
     finally:
-        REQUEST_LATENCY.labels(method="chat").observe(time.perf_counter() - start_time)
+        elapsed = time.perf_counter() - start_time
+        REQUEST_LATENCY.labels(method="chat").observe(elapsed)
+        TENANT_REQUEST_LATENCY.labels(tenant=tenant).observe(elapsed)
+        TENANT_REQUESTS.labels(tenant=tenant, status=status).inc()
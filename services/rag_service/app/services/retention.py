@@ -0,0 +1,167 @@
+"""Message partition maintenance and retention job."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.database import db
+from app.core.metrics import RETENTION_PARTITIONS_ARCHIVED, RETENTION_SESSIONS_DELETED
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for pg_try_advisory_xact_lock so one process runs the job
+RETENTION_LOCK_ID = 4815162343
+
+PARTITION_NAME = re.compile(r"^messages_p(\d{4})(\d{2})$")
+SESSION_DELETE_BATCH = 1000
+
+
+def _month_start(day: date) -> date:
+    """First day of month."""
+    return day.replace(day=1)
+
+
+def _next_month(day: date) -> date:
+    """First day of following month."""
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+async def ensure_partitions(conn: AsyncConnection, start: date, months_ahead: int) -> None:
+    """Create monthly messages partitions from start month to months_ahead after now."""
+    month = _month_start(start)
+    last = _month_start(datetime.now(timezone.utc).date())
+    for _ in range(months_ahead):
+        last = _next_month(last)
+
+    while month <= last:
+        name = f"messages_p{month:%Y%m}"
+        if not await conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}):
+            await create_partition(conn, name, month, _next_month(month))
+        month = _next_month(month)
+
+
+async def create_partition(conn: AsyncConnection, name: str, start: date, end: date) -> None:
+    """Create messages partition for [start, end).
+
+    Postgres refuses to create a partition while the default partition holds
+    rows in its range, so such rows are moved: the default partition is
+    detached, the new partition created, the rows re-inserted through the
+    parent and the default partition attached again.
+    """
+    bounds = {"start": start, "end": end}
+    create = (
+        f"CREATE TABLE {name} PARTITION OF messages "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+    stray = await conn.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM messages_default WHERE created_at >= :start AND created_at < :end)"
+    ), bounds)
+    if not stray:
+        await conn.execute(text(create))
+        return
+
+    await conn.execute(text("ALTER TABLE messages DETACH PARTITION messages_default"))
+    await conn.execute(text(create))
+    moved = await conn.execute(text("""
+        WITH moved AS (
+            DELETE FROM messages_default WHERE created_at >= :start AND created_at < :end
+            RETURNING id, session_id, role, content, created_at
+        )
+        INSERT INTO messages (id, session_id, role, content, created_at) SELECT * FROM moved
+    """), bounds)
+    await conn.execute(text("ALTER TABLE messages ATTACH PARTITION messages_default DEFAULT"))
+    logger.warning("Moved %d messages from default partition to %s", moved.rowcount, name)
+
+
+async def archive_partitions(conn: AsyncConnection, cutoff: date) -> int:
+    """Detach partitions entirely older than cutoff; move to archive schema or drop."""
+    result = await conn.execute(text("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = 'messages'
+    """))
+
+    archived = 0
+    for (name,) in result.all():
+        match = PARTITION_NAME.match(name)
+        if not match:
+            continue
+        month = date(int(match.group(1)), int(match.group(2)), 1)
+        if _next_month(month) > cutoff:
+            continue
+
+        await conn.execute(text(f"ALTER TABLE messages DETACH PARTITION {name}"))
+        schema = settings.MESSAGE_ARCHIVE_SCHEMA
+        if schema:
+            # Archived rows must not block or cascade from session deletes
+            constraints = await conn.execute(text(
+                "SELECT conname FROM pg_constraint WHERE conrelid = CAST(:name AS regclass) AND contype = 'f'"
+            ), {"name": name})
+            for (constraint,) in constraints.all():
+                await conn.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"'))
+            await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+            await conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {schema}"))
+        else:
+            await conn.execute(text(f"DROP TABLE {name}"))
+
+        archived += 1
+        RETENTION_PARTITIONS_ARCHIVED.inc()
+        logger.info("Archived messages partition %s", name)
+
+    return archived
+
+
+async def purge_sessions(conn: AsyncConnection, cutoff: date) -> int:
+    """Delete sessions older than cutoff that have no live messages left."""
+    deleted = 0
+    while True:
+        result = await conn.execute(text("""
+            DELETE FROM chat_sessions WHERE id IN (
+                SELECT s.id FROM chat_sessions s
+                WHERE s.created_at < :cutoff
+                  AND NOT EXISTS (SELECT 1 FROM messages m WHERE m.session_id = s.id)
+                LIMIT :batch
+            )
+        """), {"cutoff": cutoff, "batch": SESSION_DELETE_BATCH})
+        deleted += result.rowcount
+        if result.rowcount < SESSION_DELETE_BATCH:
+            break
+
+    RETENTION_SESSIONS_DELETED.inc(deleted)
+    return deleted
+
+
+async def run_retention() -> None:
+    """Create upcoming partitions, archive expired ones and purge empty sessions."""
+    today = datetime.now(timezone.utc).date()
+    cutoff = today - timedelta(days=settings.MESSAGE_RETENTION_DAYS)
+
+    async with db.engine.begin() as conn:
+        locked = await conn.scalar(
+            text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": RETENTION_LOCK_ID}
+        )
+        if not locked:
+            return
+
+        await ensure_partitions(conn, today, settings.MESSAGE_PARTITIONS_AHEAD)
+        archived = await archive_partitions(conn, cutoff)
+        deleted = await purge_sessions(conn, cutoff)
+
+    logger.info("Retention done: %d partitions archived, %d sessions deleted", archived, deleted)
+
+
+async def retention_loop() -> None:
+    """Run retention job periodically."""
+    while True:
+        try:
+            await run_retention()
+        except Exception as e:
+            logger.exception("Retention job failed: %s", e)
+        await asyncio.sleep(settings.RETENTION_INTERVAL_SECONDS)
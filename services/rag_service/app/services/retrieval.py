@@ -0,0 +1,275 @@
+"""Post-retrieval processing: merge chunks, cut by score, diversify with MMR, expand to neighbors."""
+from __future__ import annotations
+
+from collections import defaultdict
+
+import numpy as np
+import tiktoken
+
+from app.core.config import settings
+from app.core.metrics import RETRIEVAL_CHUNKS
+
+# Shorter overlaps are kept rather than risk cutting an accidental match
+STITCH_MIN_OVERLAP_CHARS = 8
+
+encoding = tiktoken.get_encoding(settings.TIKTOKEN_ENCODING)
+
+
+def stitch(left: str, right: str, overlap: int) -> str:
+    """Join consecutive chunks split with overlap tokens, dropping the overlap from right.
+
+    Overlap is cut only when left ends with exactly right's first overlap
+    tokens, otherwise chunks are concatenated as is.
+    """
+    if overlap <= 0:
+        return left + right
+    head = encoding.decode(encoding.encode(right, disallowed_special=())[:overlap])
+    if len(head) >= STITCH_MIN_OVERLAP_CHARS and right.startswith(head) and left.endswith(head):
+        return left + right[len(head):]
+    return left + right
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _chunk_tokens(chunk: dict) -> int:
+    """Token count stored at ingestion, estimated for older points."""
+    return chunk.get("token_count") or len(chunk["content"]) // 4
+
+
+def merge_adjacent(hits: list[dict], overlap: int = 0, max_tokens: int | None = None) -> list[dict]:
+    """Merge hits from same page with consecutive chunk_index into single passages.
+
+    Merged passage keeps best score, first chunk_index and mean direction of
+    member vectors. Passages are returned by descending score. Overlap is the
+    token overlap chunks were split with; with max_tokens, a run that would
+    grow past it starts a new passage.
+    """
+    groups: dict[tuple, list[dict]] = defaultdict(list)
+    passages = []
+    for hit in hits:
+        if hit.get("chunk_index") is None:
+            passages.append({**hit, "chunk_count": 1})
+        else:
+            groups[(hit["source"], hit["page"])].append(hit)
+
+    for members in groups.values():
+        members.sort(key=lambda h: h["chunk_index"])
+        run = [members[0]]
+        tokens = _chunk_tokens(members[0])
+        for hit in members[1:]:
+            if hit["chunk_index"] == run[-1]["chunk_index"]:
+                continue
+            cost = max(_chunk_tokens(hit) - overlap, 0)
+            if hit["chunk_index"] == run[-1]["chunk_index"] + 1 and (
+                max_tokens is None or tokens + cost <= max_tokens
+            ):
+                run.append(hit)
+                tokens += cost
+            else:
+                passages.append(_merge_run(run, overlap))
+                run = [hit]
+                tokens = _chunk_tokens(hit)
+        passages.append(_merge_run(run, overlap))
+
+    passages.sort(key=lambda p: p["score"], reverse=True)
+    return passages
+
+
+def _merge_run(run: list[dict], overlap: int) -> dict:
+    """Combine run of consecutive chunks into one passage."""
+    passage = {**run[0], "chunk_count": len(run)}
+    if len(run) == 1:
+        return passage
+
+    content = run[0]["content"]
+    for hit in run[1:]:
+        content = stitch(content, hit["content"], overlap)
+    passage["content"] = content
+    best = max(run, key=lambda hit: hit["score"])
+    passage["score"] = best["score"]
+    passage["best_chunk_index"] = best["chunk_index"]
+    if all(hit.get("vector") is not None for hit in run):
+        mean = _unit(np.asarray([hit["vector"] for hit in run], dtype=np.float32)).mean(axis=0)
+        passage["vector"] = _unit(mean)
+    return passage
+
+
+def mmr_select(relevance: np.ndarray, vectors: np.ndarray, k: int, lambda_: float) -> list[int]:
+    """Pick k indices maximizing lambda * relevance - (1 - lambda) * max similarity to picked."""
+    n = len(relevance)
+    if n <= k:
+        return [int(i) for i in np.argsort(-relevance)]
+
+    unit = _unit(vectors)
+    similarity = unit @ unit.T
+
+    first = int(np.argmax(relevance))
+    selected = [first]
+    max_similarity = similarity[first].copy()
+    available = np.ones(n, dtype=bool)
+    available[first] = False
+
+    while len(selected) < k:
+        scores = lambda_ * relevance - (1 - lambda_) * max_similarity
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+
+    return selected
+
+
+def adaptive_k(scores: list[float], max_k: int, max_gap: float, min_k: int = 1) -> int:
+    """Cut descending scores before first drop wider than max_gap, keeping min_k..max_k."""
+    k = min(len(scores), max_k)
+    for i in range(max(min_k, 1), k):
+        if scores[i - 1] - scores[i] > max_gap:
+            return i
+    return k
+
+
+def diversify(
+    hits: list[dict],
+    k: int,
+    lambda_: float,
+    use_mmr: bool = True,
+    floor: float | None = None,
+    max_gap: float | None = None,
+    min_k: int = 1,
+    overlap: int = 0,
+    max_tokens: int | None = None,
+) -> list[dict]:
+    """Merge adjacent chunks and return up to k diverse passages without vectors.
+
+    With floor, passages scoring below it are discarded except the best min_k, so
+    caller can still judge confidence. With max_gap, k is lowered by adaptive_k.
+    Merged passages stay within max_tokens.
+    """
+    passages = merge_adjacent(hits, overlap, max_tokens)
+    RETRIEVAL_CHUNKS.labels(outcome="merged").inc(len(hits) - len(passages))
+    if floor is not None and passages:
+        keep = max(min_k, 1)
+        kept = passages[:keep] + [p for p in passages[keep:] if p["score"] >= floor]
+        RETRIEVAL_CHUNKS.labels(outcome="below_floor").inc(len(passages) - len(kept))
+        passages = kept
+    if max_gap is not None:
+        k = adaptive_k([p["score"] for p in passages], k, max_gap, min_k)
+
+    if use_mmr and len(passages) > k and all(p.get("vector") is not None for p in passages):
+        relevance = np.asarray([p["score"] for p in passages], dtype=np.float32)
+        vectors = np.asarray([p["vector"] for p in passages], dtype=np.float32)
+        chosen = [passages[i] for i in mmr_select(relevance, vectors, k, lambda_)]
+    else:
+        chosen = passages[:k]
+
+    RETRIEVAL_CHUNKS.labels(outcome="dropped").inc(len(passages) - len(chosen))
+    RETRIEVAL_CHUNKS.labels(outcome="selected").inc(len(chosen))
+
+    return [{key: value for key, value in p.items() if key != "vector"} for p in chosen]
+
+
+def neighbor_ranges(passages: list[dict], window: int) -> list[tuple[str, int, int, int]]:
+    """Chunk ranges (source, page, first, last) covering each passage plus window neighbors."""
+    ranges = []
+    for p in passages:
+        if p.get("chunk_index") is None:
+            continue
+        first = p["chunk_index"]
+        last = first + p.get("chunk_count", 1) - 1
+        ranges.append((p["source"], p["page"], max(first - window, 0), last + window))
+    return ranges
+
+
+def expand_passages(passages: list[dict], chunks: list[dict], budget: int, overlap: int) -> list[dict]:
+    """Grow passages with neighboring chunks within token budget and stitch them.
+
+    Budget is shared equally between passages and covers whole passage: one
+    already larger than its share is trimmed from the end farther from its
+    best chunk. Following chunks are preferred over preceding ones. Passages
+    that grow into each other are merged.
+    """
+    by_position = {(c["source"], c["page"], c["chunk_index"]): c for c in chunks}
+    share = budget // max(len(passages), 1)
+
+    spans: list[list] = []
+    added = trimmed = 0
+    for p in passages:
+        page = (p["source"], p["page"])
+        first = p.get("chunk_index")
+        if first is None:
+            spans.append([p, None, None])
+            continue
+        last = first + p.get("chunk_count", 1) - 1
+        if any((*page, i) not in by_position for i in range(first, last + 1)):
+            spans.append([p, None, None])
+            continue
+
+        tokens = sum(_chunk_tokens(by_position[(*page, i)]) for i in range(first, last + 1))
+        tokens -= overlap * (last - first)
+        best = p.get("best_chunk_index", first)
+        while tokens > share and first < last:
+            if last - best >= best - first:
+                tokens -= max(_chunk_tokens(by_position[(*page, last)]) - overlap, 0)
+                last -= 1
+            else:
+                tokens -= max(_chunk_tokens(by_position[(*page, first)]) - overlap, 0)
+                first += 1
+            trimmed += 1
+
+        grown = True
+        while grown:
+            grown = False
+            for position in (last + 1, first - 1):
+                chunk = by_position.get((*page, position))
+                if chunk is None:
+                    continue
+                cost = max(_chunk_tokens(chunk) - overlap, 0)
+                if tokens + cost > share:
+                    continue
+                tokens += cost
+                added += 1
+                grown = True
+                if position > last:
+                    last = position
+                else:
+                    first = position
+        spans.append([p, first, last])
+
+    merged: list[list] = []
+    for p, first, last in spans:
+        if first is not None:
+            for entry in merged:
+                other, lo, hi = entry
+                if (
+                    lo is not None
+                    and (other["source"], other["page"]) == (p["source"], p["page"])
+                    and first <= hi + 1
+                    and lo <= last + 1
+                ):
+                    entry[0] = {**other, "score": max(other["score"], p["score"])}
+                    entry[1], entry[2] = min(lo, first), max(hi, last)
+                    break
+            else:
+                merged.append([p, first, last])
+        else:
+            merged.append([p, first, last])
+
+    RETRIEVAL_CHUNKS.labels(outcome="expanded").inc(added)
+    RETRIEVAL_CHUNKS.labels(outcome="trimmed").inc(trimmed)
+
+    result = []
+    for p, first, last in merged:
+        if first is None:
+            result.append(p)
+            continue
+        page = (p["source"], p["page"])
+        content = by_position[(*page, first)]["content"]
+        for i in range(first + 1, last + 1):
+            content = stitch(content, by_position[(*page, i)]["content"], overlap)
+        result.append({**p, "chunk_index": first, "chunk_count": last - first + 1, "content": content})
+    return result
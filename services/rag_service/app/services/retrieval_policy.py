@@ -0,0 +1,57 @@
+"""Policy deciding whether retrieved passages justify an LLM call."""
+from __future__ import annotations
+
+from app.core.config import settings
+from app.core.metrics import (
+    LLM_SECONDS_SAVED,
+    RETRIEVAL_DECISIONS,
+    RETRIEVAL_DEPTH,
+    RETRIEVAL_TOP_SCORE,
+)
+
+GENERATE = "generate"
+NO_RESULTS = "no_results"
+LOW_CONFIDENCE = "low_confidence"
+
+
+class AnswerPolicy:
+    """Skip LLM when best passage scores below confidence threshold."""
+
+    def __init__(
+        self,
+        enabled: bool = settings.RETRIEVAL_ADAPTIVE_ENABLED,
+        min_confidence: float = settings.RETRIEVAL_MIN_CONFIDENCE,
+        smoothing: float = 0.1,
+    ) -> None:
+        """Initialize policy."""
+        self.enabled = enabled
+        self.min_confidence = min_confidence
+        self.smoothing = smoothing
+        # Moving average of LLM latency, used to estimate time saved by skipping it
+        self.llm_seconds: float | None = None
+
+    def decide(self, passages: list[dict]) -> str:
+        """Return GENERATE, NO_RESULTS or LOW_CONFIDENCE for passages and record it."""
+        if not passages:
+            decision = NO_RESULTS
+        else:
+            top = max(p["score"] for p in passages)
+            RETRIEVAL_TOP_SCORE.observe(top)
+            decision = LOW_CONFIDENCE if self.enabled and top < self.min_confidence else GENERATE
+
+        RETRIEVAL_DECISIONS.labels(decision=decision).inc()
+        if decision == GENERATE:
+            RETRIEVAL_DEPTH.observe(len(passages))
+        elif decision == LOW_CONFIDENCE and self.llm_seconds is not None:
+            LLM_SECONDS_SAVED.inc(self.llm_seconds)
+        return decision
+
+    def record_llm_latency(self, seconds: float) -> None:
+        """Update moving average of LLM latency."""
+        if self.llm_seconds is None:
+            self.llm_seconds = seconds
+        else:
+            self.llm_seconds += self.smoothing * (seconds - self.llm_seconds)
+
+
+answer_policy = AnswerPolicy()
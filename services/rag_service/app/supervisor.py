@@ -0,0 +1,146 @@
+"""Multi-process supervisor for query and ingestion workers.
+
+Run with ``python -m app.supervisor``. Spawns QUERY_WORKERS gRPC workers sharing
+GRPC_PORT via SO_REUSEPORT and INGEST_WORKERS RabbitMQ consumers that also serve
+IngestDocument on INGEST_GRPC_PORT, restarts workers that exit, and serves
+metrics aggregated across all processes. Message retention runs here once
+rather than in every worker.
+"""
+import asyncio
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from app.core.config import settings
+
+# Must be set before prometheus_client is imported anywhere in this process
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+from prometheus_client import multiprocess  # noqa: E402
+
+from app.core.database import db  # noqa: E402
+from app.core.metrics_server import start_metrics_server  # noqa: E402
+from app.infrastructure.qdrant import qdrant_service  # noqa: E402
+from app.services.retention import retention_loop  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+RESTART_DELAY_SECONDS = 2.0
+SHUTDOWN_TIMEOUT_SECONDS = 15.0
+
+
+async def init_storage() -> None:
+    """Apply database migrations and create Qdrant collection once before workers start."""
+    logger.info("Connecting to PostgreSQL...")
+    await db.migrate()
+    await db.close()
+    logger.info("Database ready")
+
+    logger.info("Initializing Qdrant...")
+    await qdrant_service.init_collection()
+    logger.info("Qdrant ready")
+
+
+class Supervisor:
+    """Spawn, watch and stop worker processes."""
+
+    def __init__(self, query_workers: int, ingest_workers: int) -> None:
+        """Initialize worker layout."""
+        self.layout = [("query", i) for i in range(query_workers)]
+        self.layout += [("ingest", i) for i in range(ingest_workers)]
+        self.workers: dict[tuple[str, int], subprocess.Popen] = {}
+        self.stopping = False
+
+    def spawn(self, role: str, index: int) -> None:
+        """Start single worker process."""
+        env = {
+            **os.environ,
+            "SERVICE_ROLE": role,
+            "SUPERVISED": "true",
+            "WORKER_INDEX": str(index),
+        }
+        if settings.DEBUG_PORT_BASE:
+            env["DEBUG_PORT"] = str(settings.DEBUG_PORT_BASE + self.layout.index((role, index)))
+        proc = subprocess.Popen([sys.executable, MAIN_SCRIPT], env=env)
+        self.workers[(role, index)] = proc
+        logger.info("Started %s worker %d (pid %d)", role, index, proc.pid)
+
+    def run(self) -> None:
+        """Start all workers and restart those that exit until stopped."""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        for role, index in self.layout:
+            self.spawn(role, index)
+
+        while not self.stopping:
+            for (role, index), proc in list(self.workers.items()):
+                code = proc.poll()
+                if code is None:
+                    continue
+                multiprocess.mark_process_dead(proc.pid)
+                logger.warning(
+                    "%s worker %d (pid %d) exited with code %s, restarting",
+                    role, index, proc.pid, code,
+                )
+                time.sleep(RESTART_DELAY_SECONDS)
+                if not self.stopping:
+                    self.spawn(role, index)
+            time.sleep(1.0)
+
+        self.shutdown()
+
+    def stop(self, signum, frame) -> None:
+        """Signal handler: request graceful shutdown."""
+        logger.info("Received signal %d, stopping workers", signum)
+        self.stopping = True
+
+    def shutdown(self) -> None:
+        """Interrupt workers and kill those that don't exit in time."""
+        for proc in self.workers.values():
+            if proc.poll() is None:
+                proc.send_signal(signal.SIGINT)
+
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT_SECONDS
+        for proc in self.workers.values():
+            try:
+                proc.wait(timeout=max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                logger.warning("Worker pid %d did not stop, killing", proc.pid)
+                proc.kill()
+                proc.wait()
+            multiprocess.mark_process_dead(proc.pid)
+
+
+def main() -> None:
+    """Supervisor entry point."""
+    asyncio.run(init_storage())
+    start_metrics_server()
+
+    if settings.MESSAGE_RETENTION_ENABLED:
+        threading.Thread(
+            target=asyncio.run, args=(retention_loop(),), name="retention", daemon=True
+        ).start()
+
+    supervisor = Supervisor(settings.QUERY_WORKERS, settings.INGEST_WORKERS)
+    logger.info(
+        "Supervisor started: %d query workers, %d ingestion workers",
+        settings.QUERY_WORKERS, settings.INGEST_WORKERS,
+    )
+    supervisor.run()
+
+
+if __name__ == "__main__":
+    main()
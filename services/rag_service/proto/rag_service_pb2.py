@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11rag_service.proto\x12\x02v1\"W\n\x0b\x43hatRequest\x12\x0f\n\x07message\x18\x01 \x01(\t\x12#\n\x07history\x18\x02 \x03(\x0b\x32\x12.v1.MessageHistory\x12\x12\n\nsession_id\x18\x03 \x01(\t\"/\n\x0eMessageHistory\x12\x0c\n\x04role\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\t\"O\n\x0c\x43hatResponse\x12\x0e\n\x06\x61nswer\x18\x01 \x01(\t\x12\x1b\n\x07sources\x18\x02 \x03(\x0b\x32\n.v1.Source\x12\x12\n\nsession_id\x18\x03 \x01(\t\"7\n\x06Source\x12\x10\n\x08\x64oc_name\x18\x01 \x01(\t\x12\x0c\n\x04page\x18\x02 \x01(\x05\x12\r\n\x05score\x18\x03 \x01(\x02\x32<\n\nRagService\x12.\n\tGetAnswer\x12\x0f.v1.ChatRequest\x1a\x10.v1.ChatResponseB!Z\x1fneuro_search/gateway/pkg/api/v1b\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11rag_service.proto\x12\x02v1\"j\n\x0b\x43hatRequest\x12\x0f\n\x07message\x18\x01 \x01(\t\x12#\n\x07history\x18\x02 \x03(\x0b\x32\x12.v1.MessageHistory\x12\x12\n\nsession_id\x18\x03 \x01(\t\x12\x11\n\ttenant_id\x18\x04 \x01(\t\"/\n\x0eMessageHistory\x12\x0c\n\x04role\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\t\"O\n\x0c\x43hatResponse\x12\x0e\n\x06\x61nswer\x18\x01 \x01(\t\x12\x1b\n\x07sources\x18\x02 \x03(\x0b\x32\n.v1.Source\x12\x12\n\nsession_id\x18\x03 \x01(\t\"7\n\x06Source\x12\x10\n\x08\x64oc_name\x18\x01 \x01(\t\x12\x0c\n\x04page\x18\x02 \x01(\x05\x12\r\n\x05score\x18\x03 \x01(\x02\"@\n\x0bIngestChunk\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x11\n\ttenant_id\x18\x02 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\"Y\n\x0eIngestResponse\x12\x10\n\x08\x64oc_name\x18\x01 \x01(\t\x12\x16\n\x0e\x62ytes_received\x18\x02 \x01(\x03\x12\r\n\x05pages\x18\x03 \x01(\x05\x12\x0e\n\x06\x63hunks\x18\x04 \x01(\x05\x32u\n\nRagService\x12.\n\tGetAnswer\x12\x0f.v1.ChatRequest\x1a\x10.v1.ChatResponse\x12\x37\n\x0eIngestDocument\x12\x0f.v1.IngestChunk\x1a\x12.v1.IngestResponse(\x01\x42!Z\x1fneuro_search/gateway/pkg/api/v1b\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -33,13 +33,17 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['DESCRIPTOR']._loaded_options = None
   _globals['DESCRIPTOR']._serialized_options = b'Z\037neuro_search/gateway/pkg/api/v1'
   _globals['_CHATREQUEST']._serialized_start=25
-  _globals['_CHATREQUEST']._serialized_end=112
-  _globals['_MESSAGEHISTORY']._serialized_start=114
-  _globals['_MESSAGEHISTORY']._serialized_end=161
-  _globals['_CHATRESPONSE']._serialized_start=163
-  _globals['_CHATRESPONSE']._serialized_end=242
-  _globals['_SOURCE']._serialized_start=244
-  _globals['_SOURCE']._serialized_end=299
-  _globals['_RAGSERVICE']._serialized_start=301
-  _globals['_RAGSERVICE']._serialized_end=361
+  _globals['_CHATREQUEST']._serialized_end=131
+  _globals['_MESSAGEHISTORY']._serialized_start=133
+  _globals['_MESSAGEHISTORY']._serialized_end=180
+  _globals['_CHATRESPONSE']._serialized_start=182
+  _globals['_CHATRESPONSE']._serialized_end=261
+  _globals['_SOURCE']._serialized_start=263
+  _globals['_SOURCE']._serialized_end=318
+  _globals['_INGESTCHUNK']._serialized_start=320
+  _globals['_INGESTCHUNK']._serialized_end=384
+  _globals['_INGESTRESPONSE']._serialized_start=386
+  _globals['_INGESTRESPONSE']._serialized_end=475
+  _globals['_RAGSERVICE']._serialized_start=477
+  _globals['_RAGSERVICE']._serialized_end=594
 # @@protoc_insertion_point(module_scope)
@@ -6,14 +6,16 @@ from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Map
 DESCRIPTOR: _descriptor.FileDescriptor
 
 class ChatRequest(_message.Message):
-    __slots__ = ("message", "history", "session_id")
+    __slots__ = ("message", "history", "session_id", "tenant_id")
     MESSAGE_FIELD_NUMBER: _ClassVar[int]
     HISTORY_FIELD_NUMBER: _ClassVar[int]
     SESSION_ID_FIELD_NUMBER: _ClassVar[int]
+    TENANT_ID_FIELD_NUMBER: _ClassVar[int]
     message: str
     history: _containers.RepeatedCompositeFieldContainer[MessageHistory]
     session_id: str
-    def __init__(self, message: _Optional[str] = ..., history: _Optional[_Iterable[_Union[MessageHistory, _Mapping]]] = ..., session_id: _Optional[str] = ...) -> None: ...
+    tenant_id: str
+    def __init__(self, message: _Optional[str] = ..., history: _Optional[_Iterable[_Union[MessageHistory, _Mapping]]] = ..., session_id: _Optional[str] = ..., tenant_id: _Optional[str] = ...) -> None: ...
 
 class MessageHistory(_message.Message):
     __slots__ = ("role", "content")
@@ -42,3 +44,25 @@ class Source(_message.Message):
     page: int
     score: float
     def __init__(self, doc_name: _Optional[str] = ..., page: _Optional[int] = ..., score: _Optional[float] = ...) -> None: ...
+
+class IngestChunk(_message.Message):
+    __slots__ = ("filename", "tenant_id", "data")
+    FILENAME_FIELD_NUMBER: _ClassVar[int]
+    TENANT_ID_FIELD_NUMBER: _ClassVar[int]
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    filename: str
+    tenant_id: str
+    data: bytes
+    def __init__(self, filename: _Optional[str] = ..., tenant_id: _Optional[str] = ..., data: _Optional[bytes] = ...) -> None: ...
+
+class IngestResponse(_message.Message):
+    __slots__ = ("doc_name", "bytes_received", "pages", "chunks")
+    DOC_NAME_FIELD_NUMBER: _ClassVar[int]
+    BYTES_RECEIVED_FIELD_NUMBER: _ClassVar[int]
+    PAGES_FIELD_NUMBER: _ClassVar[int]
+    CHUNKS_FIELD_NUMBER: _ClassVar[int]
+    doc_name: str
+    bytes_received: int
+    pages: int
+    chunks: int
+    def __init__(self, doc_name: _Optional[str] = ..., bytes_received: _Optional[int] = ..., pages: _Optional[int] = ..., chunks: _Optional[int] = ...) -> None: ...
@@ -39,6 +39,11 @@ class RagServiceStub(object):
                 request_serializer=rag__service__pb2.ChatRequest.SerializeToString,
                 response_deserializer=rag__service__pb2.ChatResponse.FromString,
                 _registered_method=True)
+        self.IngestDocument = channel.stream_unary(
+                '/v1.RagService/IngestDocument',
+                request_serializer=rag__service__pb2.IngestChunk.SerializeToString,
+                response_deserializer=rag__service__pb2.IngestResponse.FromString,
+                _registered_method=True)
 
 
 class RagServiceServicer(object):
@@ -50,6 +55,13 @@ class RagServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def IngestDocument(self, request_iterator, context):
+        """Upload file in chunks and index it synchronously
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_RagServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -58,6 +70,11 @@ def add_RagServiceServicer_to_server(servicer, server):
                     request_deserializer=rag__service__pb2.ChatRequest.FromString,
                     response_serializer=rag__service__pb2.ChatResponse.SerializeToString,
             ),
+            'IngestDocument': grpc.stream_unary_rpc_method_handler(
+                    servicer.IngestDocument,
+                    request_deserializer=rag__service__pb2.IngestChunk.FromString,
+                    response_serializer=rag__service__pb2.IngestResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'v1.RagService', rpc_method_handlers)
@@ -95,3 +112,30 @@ class RagService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def IngestDocument(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/v1.RagService/IngestDocument',
+            rag__service__pb2.IngestChunk.SerializeToString,
+            rag__service__pb2.IngestResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,14 @@
+"""Test setup: import path and scratch dirs for service caches and uploads."""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "proto")]
+
+# Settings are read at import time, so point them away from /app first
+SCRATCH_DIR = tempfile.mkdtemp(prefix="rag_tests_")
+os.environ.setdefault("UPLOADS_DIR", os.path.join(SCRATCH_DIR, "uploads"))
+os.environ.setdefault("PARSED_CACHE_DIR", os.path.join(SCRATCH_DIR, "parsed_cache"))
+os.environ.setdefault("EMBEDDING_STORE_DIR", os.path.join(SCRATCH_DIR, "embedding_store"))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
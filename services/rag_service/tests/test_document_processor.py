@@ -0,0 +1,48 @@
+"""Tests for streamed ingestion."""
+import asyncio
+import hashlib
+import io
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from app.services import document_processor
+
+COLLECTION = "documents_test"
+
+
+@pytest.fixture
+def qdrant(monkeypatch):
+    """In-memory Qdrant used by ingestion, with fake embeddings."""
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        COLLECTION, vectors_config=models.VectorParams(size=16, distance=models.Distance.COSINE)
+    )
+
+    async def tenant_ready(tenant, create=False):
+        return True
+
+    monkeypatch.setattr(document_processor, "QdrantClient", lambda **kwargs: client)
+    monkeypatch.setattr(document_processor.qdrant_service, "tenant_ready", tenant_ready)
+    monkeypatch.setattr(document_processor.qdrant_service, "collection_for", lambda tenant: COLLECTION)
+    monkeypatch.setattr(
+        document_processor.embeddings_service, "document_model", DeterministicFakeEmbedding(size=16)
+    )
+    monkeypatch.setattr(document_processor.settings, "INGEST_SAVE_UPLOADS", False)
+    return client
+
+
+def test_same_stream_twice_replaces_points(qdrant):
+    """Re-uploading identical file overwrites its points instead of duplicating them."""
+    data = " ".join(f"word{i}" for i in range(2000)).encode()
+    file_hash = hashlib.sha256(data).hexdigest()
+
+    first = asyncio.run(document_processor.process_stream(io.BytesIO(data), "notes.txt", file_hash))
+    points = qdrant.count(COLLECTION).count
+    second = asyncio.run(document_processor.process_stream(io.BytesIO(data), "notes.txt", file_hash))
+
+    assert first == second
+    assert points == first[2] > 1
+    assert qdrant.count(COLLECTION).count == points
@@ -0,0 +1,59 @@
+"""Tests for post-retrieval processing."""
+from prometheus_client import REGISTRY
+
+from app.services.retrieval import diversify, expand_passages, merge_adjacent
+
+
+def chunk_count(outcome: str) -> float:
+    """Current value of retrieval chunks counter for outcome."""
+    return REGISTRY.get_sample_value("rag_retrieval_chunks_total", {"outcome": outcome}) or 0.0
+
+
+def hit(page: int, chunk_index: int, score: float, token_count: int | None = None) -> dict:
+    """Search hit without vector."""
+    return {
+        "source": "doc.txt",
+        "page": page,
+        "chunk_index": chunk_index,
+        "token_count": token_count,
+        "content": f"page {page} chunk {chunk_index}",
+        "score": score,
+    }
+
+
+def test_diversify_counts_floor_drops_apart_from_merges():
+    """Chunks cut by score floor are counted as below_floor, not merged."""
+    hits = [hit(0, 0, 0.9), hit(0, 1, 0.8), hit(1, 0, 0.1), hit(2, 0, 0.05)]
+    before = {outcome: chunk_count(outcome) for outcome in ("merged", "below_floor", "selected")}
+
+    passages = diversify(hits, k=5, lambda_=0.7, use_mmr=False, floor=0.2)
+
+    assert len(passages) == 1
+    assert chunk_count("merged") - before["merged"] == 1
+    assert chunk_count("below_floor") - before["below_floor"] == 2
+    assert chunk_count("selected") - before["selected"] == 1
+
+
+def test_merge_adjacent_caps_run_tokens():
+    """Long run of consecutive chunks is split into passages within max_tokens."""
+    hits = [hit(0, i, 0.9 - i / 100, token_count=100) for i in range(5)]
+
+    passages = merge_adjacent(hits, overlap=20, max_tokens=250)
+
+    spans = sorted((p["chunk_index"], p["chunk_count"]) for p in passages)
+    assert spans == [(0, 2), (2, 2), (4, 1)]
+    assert len(merge_adjacent(hits, overlap=20)) == 1
+
+
+def test_expand_passages_trims_passage_over_budget():
+    """Budget bounds whole passage, not only growth: oversized passage keeps chunks around its best hit."""
+    chunks = [hit(0, i, 0.0, token_count=100) for i in range(6)]
+    hits = [hit(0, i, score, token_count=100) for i, score in zip(range(1, 5), (0.5, 0.6, 0.9, 0.7))]
+    passages = merge_adjacent(hits)
+    assert passages[0]["chunk_count"] == 4
+
+    expanded = expand_passages(passages, chunks, budget=250, overlap=0)
+
+    assert len(expanded) == 1
+    assert (expanded[0]["chunk_index"], expanded[0]["chunk_count"]) == (2, 2)
+    assert expanded[0]["content"] == "page 0 chunk 2page 0 chunk 3"